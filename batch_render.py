@@ -0,0 +1,26 @@
+import argparse
+
+from src.batch_render import run_batch
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render many Circle Escape clips in parallel")
+    parser.add_argument('manifest',
+                        help="JSON list or JSON-lines file of {config, seed, output} jobs")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (defaults to the number of cores)")
+    parser.add_argument('--fps', type=int, default=60,
+                        help="Frames per simulated second")
+    parser.add_argument('--max-time', type=float, default=120.0,
+                        help="Stop a clip after this many simulated seconds")
+    parser.add_argument('--journal', default=None,
+                        help="Progress journal used to resume (defaults to <manifest>.journal.jsonl)")
+    parser.add_argument('--summary', default=None,
+                        help="Where to write per-job timings (defaults to <manifest>.summary.json)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_batch(args.manifest, workers=args.workers, fps=args.fps, max_time=args.max_time,
+              journal_path=args.journal, summary_path=args.summary)
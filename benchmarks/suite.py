@@ -0,0 +1,279 @@
+"""Fixed-seed benchmark scenarios for simulation, rendering and recording.
+
+Every scenario renders a fixed number of headless frames from the same
+seed in a fresh process, so settings and peak memory never carry over
+from one scenario to the next. Each reports frames per second (including
+the time to finish the output), per-phase p50/p95 frame times from the
+FrameProfiler, and the process's peak resident memory.
+
+    python -m benchmarks.suite                        # run everything
+    python -m benchmarks.suite baseline stress-500    # run some scenarios
+    python -m benchmarks.suite --save                 # store the results as the baseline
+    python -m benchmarks.suite --compare --repeat 3   # exit 1 on a regression
+    python -m benchmarks.suite --compare-renderers    # surface against texture drawing
+
+Baselines are only comparable on the machine that recorded them.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from src.batch_render import init_worker
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+BASELINE_VERSION = 1
+SEED = 1234
+FPS = 60
+
+SCENARIOS: Dict[str, Dict] = {
+    'baseline': {'config': {'use_icon': False, 'video_background': False, 'audio': False},
+                 'frames': 600},
+    'stress-500': {'config': {'rings': 500, 'use_icon': False, 'video_background': False, 'audio': False},
+                   'frames': 300},
+    'particle-storm': {'config': {'rings': 100, 'use_icon': False, 'video_background': False, 'audio': False},
+                       'frames': 300, 'storm': True},
+    'icon-tumble': {'config': {'use_icon': True, 'tumble': True, 'video_background': False, 'audio': False},
+                    'frames': 600},
+    'video': {'config': {'use_icon': False, 'video_background': True, 'audio': False},
+              'frames': 300, 'video': True},
+    'record-pipe': {'config': {'use_icon': False, 'video_background': False, 'audio': False},
+                    'frames': 300, 'recorder': 'pipe'},
+    'record-png': {'config': {'use_icon': False, 'video_background': False, 'audio': False},
+                   'frames': 300, 'recorder': 'png'},
+}
+
+
+def write_test_video(path: str, width: int = 360, height: int = 640, frames: int = 120):
+    """A deterministic moving gradient to stand in for bg.mp4"""
+    import cv2
+    import numpy as np
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), FPS, (width, height))
+    y, x = np.mgrid[0:height, 0:width]
+    for i in range(frames):
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[..., 0] = (x + i * 3) % 256
+        frame[..., 1] = (y + i * 2) % 256
+        frame[..., 2] = (x + y + i) % 256
+        writer.write(frame)
+    writer.release()
+
+
+def start_storm(game):
+    """Destroy every ring but the outermost at once, bursting all their particles"""
+    for index in range(len(game.rings) - 1):
+        game.rings.destroy(index)
+        game.rings[index].create_destruction_particles(game.particles)
+    game.active_ring_index = game.get_innermost_active_ring()
+
+
+def get_peak_memory() -> float:
+    """Peak resident memory of this process in MB, or None where it cannot be read"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(name: str, renderer: str = 'surface') -> Dict:
+    """Run one scenario inside a fresh worker process, drawing with the given backend"""
+    scenario = SCENARIOS[name]
+    if scenario.get('recorder') and shutil.which('ffmpeg') is None:
+        return {'status': 'skipped', 'reason': 'ffmpeg not found'}
+
+    from src.config import resolve_config
+    from src.game import Game
+    from src.profiler import FrameProfiler
+    from src.recorder import GameRecorder
+
+    config = resolve_config(dict(scenario['config'], renderer=renderer))
+    with tempfile.TemporaryDirectory() as work_dir, contextlib.ExitStack() as stack:
+        if scenario.get('video'):
+            try:
+                write_test_video(os.path.join(work_dir, 'bg.mp4'))
+            except ImportError:
+                return {'status': 'skipped', 'reason': 'OpenCV not installed'}
+            # Game plays bg.mp4 from the working directory
+            stack.callback(os.chdir, os.getcwd())
+            os.chdir(work_dir)
+
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            recorder = None
+            if scenario.get('recorder'):
+                recorder = GameRecorder(config.width, config.height, fps=FPS,
+                                        backend=scenario['recorder'],
+                                        output_path=os.path.join(work_dir, 'out.mp4'))
+            profiler = FrameProfiler(capacity=scenario['frames'])
+            game = Game(recorder=recorder, seed=SEED, profiler=profiler, config=config)
+            if scenario.get('storm'):
+                start_storm(game)
+            setup_time = time.perf_counter() - start
+
+            stats = game.run_headless(fps=FPS, max_frames=scenario['frames'])
+            start = time.perf_counter()
+            game.close()
+            finish_time = time.perf_counter() - start
+
+    elapsed = stats['wall_time'] + finish_time
+    return {
+        'status': 'ok',
+        'frames': stats['frames'],
+        'fps': stats['frames'] / elapsed if elapsed > 0 else 0.0,
+        'setup_time': setup_time,
+        'finish_time': finish_time,
+        'phases_ms': {phase: {'p50': values['p50'], 'p95': values['p95']}
+                      for phase, values in stats['profile'].items() if 'p50' in values},
+        'peak_memory_mb': get_peak_memory(),
+    }
+
+
+def run_suite(names, repeat: int = 1, renderer: str = 'surface') -> Dict:
+    """Run scenarios one after another, each in its own process, keeping the fastest of repeat runs"""
+    results = {}
+    context = multiprocessing.get_context('spawn')  # SDL state must not be forked
+    for name in names:
+        best = None
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=init_worker) as pool:
+                try:
+                    result = pool.submit(run_scenario, name, renderer).result()
+                except Exception as e:
+                    result = {'status': 'failed', 'error': f"{type(e).__name__}: {str(e)}"}
+            if result['status'] != 'ok':
+                best = result
+                break
+            if best is None or result['fps'] > best['fps']:
+                best = result
+        results[name] = best
+
+        if best['status'] == 'ok':
+            frame = best['phases_ms'].get('frame', {'p50': 0.0, 'p95': 0.0})
+            memory = best['peak_memory_mb']
+            print(f"{name:<15} {best['fps']:8.1f} fps  frame p50 {frame['p50']:6.2f} ms  "
+                  f"p95 {frame['p95']:6.2f} ms  peak memory "
+                  + (f"{memory:.0f} MB" if memory is not None else "unknown"))
+        else:
+            print(f"{name:<15} {best['status']}: {best.get('reason', best.get('error'))}")
+    return results
+
+
+def compare_renderers(names, repeat: int = 1) -> Dict[str, Dict]:
+    """Run each scenario with both drawing backends and print their fps side by side"""
+    results = {}
+    for renderer in ('surface', 'texture'):
+        print(f"--- {renderer} renderer")
+        results[renderer] = run_suite(names, repeat=repeat, renderer=renderer)
+
+    print(f"{'scenario':<15} {'surface':>12} {'texture':>12}")
+    for name in names:
+        surface, texture = results['surface'][name], results['texture'][name]
+        if surface['status'] != 'ok' or texture['status'] != 'ok':
+            print(f"{name:<15} {'':>12} {'':>12}  not comparable")
+            continue
+        change = texture['fps'] / surface['fps'] - 1
+        print(f"{name:<15} {surface['fps']:8.1f} fps {texture['fps']:8.1f} fps  ({change:+.1%})")
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> list:
+    """Scenarios whose fps fell, or peak memory grew, by more than threshold against the baseline"""
+    regressions = []
+    for name, result in results.items():
+        if result['status'] == 'failed':
+            regressions.append(f"{name}: {result['error']}")
+            continue
+        previous = baseline['scenarios'].get(name)
+        if result['status'] != 'ok' or previous is None or previous['status'] != 'ok':
+            continue
+        change = result['fps'] / previous['fps'] - 1
+        print(f"{name:<15} fps {previous['fps']:8.1f} -> {result['fps']:8.1f} ({change:+.1%})")
+        if change < -threshold:
+            regressions.append(f"{name}: fps {change:+.1%}")
+
+        for phase, values in result['phases_ms'].items():
+            before = previous['phases_ms'].get(phase)
+            if before is not None and before['p50'] > 0:
+                print(f"  {phase:<13} p50 {before['p50']:6.2f} -> {values['p50']:6.2f} ms "
+                      f"({values['p50'] / before['p50'] - 1:+.1%})")
+
+        if result['peak_memory_mb'] and previous.get('peak_memory_mb'):
+            growth = result['peak_memory_mb'] / previous['peak_memory_mb'] - 1
+            if growth > threshold:
+                regressions.append(f"{name}: peak memory {growth:+.1%}")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Circle Escape benchmark suite")
+    parser.add_argument('scenarios', nargs='*',
+                        help=f"Scenarios to run (defaults to all): {', '.join(SCENARIOS)}")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Runs per scenario; the fastest is kept")
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help="Baseline results file")
+    parser.add_argument('--save', action='store_true',
+                        help="Write the results to the baseline file")
+    parser.add_argument('--compare', action='store_true',
+                        help="Compare with the baseline and exit 1 on a regression")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Allowed fps drop or peak memory growth as a fraction")
+    parser.add_argument('--compare-renderers', action='store_true',
+                        help="Run every scenario with the surface and the texture renderer and compare fps")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}")
+    if args.compare_renderers:
+        # Baselines only hold the default renderer, so this mode neither saves nor compares
+        compare_renderers(names, repeat=args.repeat)
+        sys.exit(0)
+    results = run_suite(names, repeat=args.repeat)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('version') != BASELINE_VERSION:
+            raise SystemExit(f"{args.baseline} is from another version of the suite")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressed beyond {args.threshold:.0%}: " + "; ".join(regressions))
+            exit_code = 1
+        else:
+            print(f"No regressions beyond {args.threshold:.0%}")
+
+    if args.save:
+        baseline = {'version': BASELINE_VERSION, 'scenarios': {}}
+        if os.path.exists(args.baseline):
+            # Keep scenarios this run skipped
+            with open(args.baseline) as f:
+                previous = json.load(f)
+            if previous.get('version') == BASELINE_VERSION:
+                baseline['scenarios'] = previous['scenarios']
+        baseline['scenarios'].update(results)
+        baseline['machine'] = {'platform': platform.platform(), 'python': platform.python_version(),
+                               'cpus': os.cpu_count()}
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    sys.exit(exit_code)
@@ -0,0 +1,135 @@
+"""Micro-benchmark of the Vector2 math in the simulation hot loop.
+
+Compares the old dict-backed dataclass with the __slots__ Vector2 on the
+per-frame integration pattern, then times Game's simulation step (no
+drawing) and counts the Vector2 objects it creates per frame, with the
+in-place forms allocating as the operator-based code did and as they are.
+
+    python -m benchmarks.vector_math
+"""
+import contextlib
+import sys
+import time
+from dataclasses import dataclass
+
+from src.headless import enable_headless
+from src.utils.vector import Vector2
+
+
+@dataclass
+class DictVector2:
+    """Vector2 as it was before __slots__ and the in-place operators"""
+    x: float
+    y: float
+
+    def __add__(self, other):
+        return DictVector2(self.x + other.x, self.y + other.y)
+
+    def __mul__(self, scalar):
+        return DictVector2(self.x * scalar, self.y * scalar)
+
+
+def time_kernel(iterations: int = 200000):
+    """pos += vel * dt; vel *= 0.98, the step every moving entity takes"""
+    dt = 1.0 / 60
+
+    pos, vel = DictVector2(0.0, 0.0), DictVector2(3.0, 4.0)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pos += vel * dt  # No __iadd__: builds vel * dt, then a new pos
+        vel = vel * 0.98
+    old = (time.perf_counter() - start) / iterations
+
+    pos, vel = Vector2(0.0, 0.0), Vector2(3.0, 4.0)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        pos.add_scaled_ip(vel, dt)
+        vel *= 0.98
+    new = (time.perf_counter() - start) / iterations
+
+    old_size = sys.getsizeof(DictVector2(0.0, 0.0)) + sys.getsizeof(DictVector2(0.0, 0.0).__dict__)
+    print(f"Integration step: {old * 1e9:.0f} ns -> {new * 1e9:.0f} ns ({old / new:.1f}x), "
+          f"3 -> 0 vectors allocated")
+    print(f"Vector size: {old_size} bytes -> {sys.getsizeof(Vector2(0.0, 0.0))} bytes")
+
+
+@contextlib.contextmanager
+def allocating_in_place_ops():
+    """Make Vector2's in-place forms build the temporaries the operator-based code did.
+
+    Each one computes its result with the binary operators, as the code
+    before the in-place forms wrote it (pos += vel * dt, v = v.normalize()
+    * s, Vector2(x, y) for every snapshot), then copies it back, so the
+    arithmetic and every caller behave as before.
+    """
+    def assign(self, result):
+        self.x, self.y = result.x, result.y
+
+    def iadd(self, other):
+        assign(self, self + other)
+        return self
+
+    def isub(self, other):
+        assign(self, self - other)
+        return self
+
+    def imul(self, scalar):
+        assign(self, self * scalar)
+        return self
+
+    replacements = {
+        '__iadd__': iadd,
+        '__isub__': isub,
+        '__imul__': imul,
+        'add_scaled_ip': lambda self, other, scalar: assign(self, self + other * scalar),
+        'normalize_ip': lambda self: assign(self, self.normalize()),
+        'update': lambda self, x, y: assign(self, Vector2(x, y)),
+    }
+    originals = {name: getattr(Vector2, name) for name in replacements}
+    for name, method in replacements.items():
+        setattr(Vector2, name, method)
+    try:
+        yield
+    finally:
+        for name, method in originals.items():
+            setattr(Vector2, name, method)
+
+
+def count_frame_allocations(frames: int = 3000, seed: int = 1):
+    """Time Game's simulation step and count the Vector2s it constructs per frame, before and after"""
+    enable_headless()
+    import pygame
+    pygame.init()
+    from src.game import Game
+
+    def run(count: bool):
+        game = Game(seed=seed)
+        game.start_game()
+        created = [0]
+        original_init = Vector2.__init__
+        if count:
+            def counting_init(self, x, y):
+                created[0] += 1
+                original_init(self, x, y)
+            Vector2.__init__ = counting_init
+        try:
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.update_game_state(1.0 / 60)
+            elapsed = time.perf_counter() - start
+        finally:
+            Vector2.__init__ = original_init
+        return elapsed / frames, created[0] / frames
+
+    with allocating_in_place_ops():
+        old_per_frame, _ = run(count=False)
+        _, old_allocations = run(count=True)
+    per_frame, _ = run(count=False)
+    _, allocations = run(count=True)
+    print(f"Simulation step: {old_per_frame * 1e6:.1f} us -> {per_frame * 1e6:.1f} us per frame, "
+          f"{old_allocations:.2f} -> {allocations:.2f} Vector2 allocations per frame")
+
+
+if __name__ == "__main__":
+    time_kernel()
+    count_frame_allocations()
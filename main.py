@@ -1,9 +1,123 @@
-import pygame
-pygame.init()
-pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+import argparse
+import importlib
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Circle Escape")
+    parser.add_argument('--headless', action='store_true',
+                        help="Render offline with the SDL dummy driver as fast as possible")
+    parser.add_argument('--fps', type=int, default=60,
+                        help="Frames per simulated second in headless mode")
+    parser.add_argument('--max-frames', type=int, default=None,
+                        help="Stop a headless run after this many frames")
+    parser.add_argument('--max-time', type=float, default=120.0,
+                        help="Stop a headless run after this many simulated seconds")
+    parser.add_argument('--record', action='store_true',
+                        help="Record the run to an mp4 in recordings/")
+    parser.add_argument('--recorder', choices=['pipe', 'png'], default='pipe',
+                        help="Stream raw frames into ffmpeg, or write a PNG sequence first")
+    parser.add_argument('--output', default=None,
+                        help="Path of the recorded video")
+    parser.add_argument('--async-capture', action='store_true',
+                        help="Encode recorded frames on a writer thread")
+    parser.add_argument('--queue-size', type=int, default=8,
+                        help="Frame buffers in the async capture pool")
+    parser.add_argument('--backpressure', choices=['block', 'drop'], default='block',
+                        help="What async capture does when the pool is exhausted")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed for the simulation; the same seed and fps replay the same run")
+    parser.add_argument('--replay', default=None,
+                        help="Re-render the run stored in a replay log (sets seed and fps)")
+    parser.add_argument('--replay-out', default=None,
+                        help="Write the run's replay log to this path")
+    parser.add_argument('--balls', type=int, default=None,
+                        help="Balls sharing the rings, simulated as one batch when more than one")
+    parser.add_argument('--profile', action='store_true',
+                        help="Time each phase of every frame (F3 toggles the overlay)")
+    parser.add_argument('--profile-overlay', action='store_true',
+                        help="Profile and show the timing overlay from the first frame")
+    parser.add_argument('--profile-out', default=None,
+                        help="Profile and write the frame timings to this .json or .csv at exit")
+    parser.add_argument('--no-audio', action='store_true',
+                        help="Skip the mixer and sound loading (implied by --headless without --record)")
+    parser.add_argument('--no-video', action='store_true',
+                        help="Skip the bg.mp4 background")
+    parser.add_argument('--renderer', choices=['surface', 'texture'], default=None,
+                        help="Draw with software Surface blits or SDL Renderer/Texture draws")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="Print the time spent in each import and initialization stage")
+    return parser.parse_args()
 
-from src.game import Game
 
 if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+    from src.startup import StartupReport
+    startup = StartupReport()
+    args = parse_args()
+    # Nothing can be heard from a headless run that is not recorded
+    no_audio = args.no_audio or (args.headless and not args.record)
+    # SDL reads the driver variables during init, so this must come first
+    from src.headless import enable_headless, disable_audio_device
+    if args.headless:
+        enable_headless()
+    elif no_audio:
+        disable_audio_device()
+
+    # Imported only to time it: numpy first, so its share of the pygame import is reported separately
+    importlib.import_module('numpy')
+    startup.lap('import numpy')
+    import pygame
+    startup.lap('import pygame')
+    from src.config import snapshot_config
+    from src.game import Game
+    from src.profiler import FrameProfiler
+    from src.recorder import GameRecorder
+    from src.replay import ReplayLog
+    startup.lap('import game modules')
+
+    config = snapshot_config()
+    if args.balls is not None:
+        config = config.replace(balls=args.balls)
+    if no_audio:
+        config = config.replace(audio=False)
+    if args.no_video:
+        config = config.replace(video_background=False)
+    if args.renderer is not None:
+        config = config.replace(renderer=args.renderer)
+
+    replay = None
+    if args.replay:
+        replay = ReplayLog.load(args.replay)
+        if replay.fps:
+            args.fps = int(replay.fps)
+    startup.lap('settings')
+
+    recorder = None
+    if args.record:
+        recorder = GameRecorder(config.width, config.height, fps=args.fps,
+                                backend=args.recorder, output_path=args.output,
+                                async_capture=args.async_capture, queue_size=args.queue_size,
+                                backpressure=args.backpressure)
+        startup.lap('recorder')
+
+    profiler = None
+    if args.profile or args.profile_overlay or args.profile_out:
+        profiler = FrameProfiler()
+        profiler.visible = args.profile_overlay
+
+    game = Game(recorder=recorder, seed=args.seed, replay=replay, profiler=profiler,
+                config=config, startup=startup)
+    print(f"Seed: {game.seed}")
+    if args.headless:
+        game.run_headless(fps=args.fps, max_frames=args.max_frames, max_time=args.max_time)
+        game.close()
+        pygame.quit()
+    else:
+        game.run()
+
+    if args.replay_out:
+        game.replay_log.save(args.replay_out)
+        print(f"Replay log saved to {args.replay_out}")
+    if args.profile_out:
+        profiler.dump(args.profile_out)
+    if args.startup_report:
+        startup.print_report()
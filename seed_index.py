@@ -0,0 +1,74 @@
+import argparse
+import json
+import math
+import time
+
+from src.config import resolve_config
+from src.seed_index import SeedIndex
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Index simulated Circle Escape seeds and search them")
+    parser.add_argument('--index', default='seeds.db',
+                        help="SQLite index file")
+    parser.add_argument('--config', default='{}',
+                        help="JSON CONFIG overrides, as in a batch manifest job")
+    parser.add_argument('--fps', type=int, default=60,
+                        help="Frames per simulated second the clips will be rendered at")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fill = commands.add_parser('fill', help="Simulate seeds the index does not have yet")
+    fill.add_argument('--seeds', type=int, default=100000,
+                      help="Number of consecutive seeds to cover")
+    fill.add_argument('--start', type=int, default=0,
+                      help="First seed")
+    fill.add_argument('--max-time', type=float, default=120.0,
+                      help="Give up on a game after this many simulated seconds")
+    fill.add_argument('--workers', type=int, default=None,
+                      help="Worker processes (defaults to the number of cores)")
+
+    query = commands.add_parser('query', help="List indexed seeds matching the criteria, fastest first")
+    query.add_argument('--min-escape', type=float, default=0.0,
+                       help="Earliest escape time in seconds")
+    query.add_argument('--max-escape', type=float, default=math.inf,
+                       help="Latest escape time in seconds")
+    query.add_argument('--finale-rings', type=int, default=None,
+                       help="With --finale-within: how many of the last rings must pop close together")
+    query.add_argument('--finale-within', type=float, default=None,
+                       help="Seconds in which the last --finale-rings rings must all pop")
+    query.add_argument('--max-bounces', type=int, default=None,
+                       help="Most bounces allowed")
+    query.add_argument('--limit', type=int, default=20,
+                       help="Most seeds to list")
+    args = parser.parse_args()
+    if args.command == 'query' and args.finale_within is not None and args.finale_rings is None:
+        parser.error("--finale-within requires --finale-rings")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = resolve_config(json.loads(args.config))
+    index = SeedIndex(args.index)
+
+    if args.command == 'fill':
+        start = time.perf_counter()
+        added = index.fill(config, range(args.start, args.start + args.seeds), fps=args.fps,
+                           max_time=args.max_time, workers=args.workers)
+        total, escaped = index.count(config, args.fps)
+        print(f"Added {added} seeds in {time.perf_counter() - start:.1f}s; "
+              f"{total} indexed for this config, {escaped} escape")
+    else:
+        if args.finale_rings is not None and not 1 <= args.finale_rings <= config.rings:
+            raise SystemExit(f"--finale-rings must be between 1 and {config.rings}")
+        start = time.perf_counter()
+        matches = index.query(config, fps=args.fps, min_escape=args.min_escape, max_escape=args.max_escape,
+                              finale_rings=args.finale_rings, finale_within=args.finale_within,
+                              max_bounces=args.max_bounces, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        for match in matches:
+            finale = "n/a" if match['finale'] is None else f"{match['finale']:.2f}s"
+            print(f"seed {match['seed']}: escapes at {match['escape_time']:.2f}s, "
+                  f"{match['bounces']} bounces, final rings in {finale}")
+        print(f"{len(matches)} seeds in {elapsed * 1000:.1f} ms")
+    index.close()
@@ -0,0 +1,38 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.simulation import BatchSimulation
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate many Circle Escape seeds without rendering")
+    parser.add_argument('--seeds', type=int, default=10000,
+                        help="Number of consecutive seeds to simulate")
+    parser.add_argument('--start', type=int, default=0,
+                        help="First seed")
+    parser.add_argument('--fps', type=int, default=60,
+                        help="Frames per simulated second (must match the render to reproduce it)")
+    parser.add_argument('--max-time', type=float, default=120.0,
+                        help="Give up on a game after this many simulated seconds")
+    parser.add_argument('--top', type=int, default=10,
+                        help="How many of the fastest escapes to list")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    outcomes = BatchSimulation(range(args.start, args.start + args.seeds)).run(args.fps, args.max_time)
+    elapsed = time.perf_counter() - start
+
+    escaped = outcomes['escaped']
+    print(f"Simulated {args.seeds} games ({outcomes['frames'].sum()} frames) in {elapsed:.2f}s; "
+          f"{escaped.sum()} escaped within {args.max_time:.0f}s")
+    order = np.argsort(np.where(escaped, outcomes['escape_time'], np.inf))[:args.top]
+    for k in order:
+        if not escaped[k]:
+            break
+        print(f"seed {outcomes['seed'][k]}: escaped at {outcomes['escape_time'][k]:.2f}s "
+              f"after {outcomes['bounces'][k]} bounces")
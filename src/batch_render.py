@@ -0,0 +1,154 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+
+def load_manifest(path: str) -> List[Dict]:
+    """Read jobs from a JSON list or a JSON-lines file.
+
+    Each job is {"config": {...overrides}, "seed": int, "output": "clip.mp4"}
+    with an optional "id" (defaults to the output path).
+    """
+    with open(path) as f:
+        text = f.read().strip()
+    if text.startswith('['):
+        jobs = json.loads(text)
+    else:
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    for job in jobs:
+        if 'output' not in job:
+            raise ValueError(f"Job is missing an output path: {job}")
+        job.setdefault('id', job['output'])
+        job.setdefault('config', {})
+        job.setdefault('seed', 0)
+    return jobs
+
+
+def load_journal(path: str) -> Dict[str, Dict]:
+    """Return the finished jobs recorded in the journal, keyed by job id"""
+    finished = {}
+    if not os.path.exists(path):
+        return finished
+    with open(path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # A line cut short by a crash
+            if result.get('status') == 'ok':
+                finished[result['id']] = result
+    return finished
+
+
+def init_worker():
+    """Bring up pygame headless once per worker process"""
+    from src.headless import enable_headless
+    enable_headless()
+
+    import pygame
+    from src.managers.audio_manager import MIXER_SETTINGS
+    pygame.mixer.pre_init(**MIXER_SETTINGS)
+    pygame.init()
+
+
+def render_job(job: Dict, fps: int, max_time: float) -> Dict:
+    """Render one job to its output path inside a worker process"""
+    result = {'id': job['id'], 'output': job['output'], 'seed': job['seed']}
+    start = time.perf_counter()
+    try:
+        from src.config import resolve_config
+        from src.game import Game
+        from src.recorder import GameRecorder
+
+        # Each job gets its own config, so overrides never leak into the next job
+        config = resolve_config(job['config'])
+
+        output_dir = os.path.dirname(job['output'])
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        recorder = GameRecorder(config.width, config.height, fps=fps, output_path=job['output'])
+        game = Game(recorder=recorder, seed=job['seed'], config=config)
+        setup_time = time.perf_counter() - start
+        stats = game.run_headless(fps=fps, max_time=job.get('max_time', max_time))
+        game.close()
+
+        result.update(stats)
+        result['setup_time'] = setup_time
+        # Game.close stopped the recorder; a missing or truncated video is a failed job
+        if recorder.error is not None:
+            result['status'] = 'failed'
+            result['error'] = recorder.error
+        else:
+            result['status'] = 'ok' if os.path.exists(job['output']) else 'failed'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+    result['total_time'] = time.perf_counter() - start
+    return result
+
+
+def run_batch(manifest_path: str, workers: int = None, fps: int = 60, max_time: float = 120.0,
+              journal_path: str = None, summary_path: str = None) -> Dict:
+    """Render every job in the manifest over a process pool, resuming from the journal"""
+    jobs = load_manifest(manifest_path)
+    journal_path = journal_path or manifest_path + '.journal.jsonl'
+    summary_path = summary_path or manifest_path + '.summary.json'
+    workers = workers or os.cpu_count() or 1
+
+    # Resume: skip jobs the journal says finished and whose video is still on disk
+    finished = load_journal(journal_path)
+    pending = [job for job in jobs
+               if not (job['id'] in finished and os.path.exists(job['output']))]
+    print(f"{len(jobs)} jobs, {len(jobs) - len(pending)} already done, "
+          f"{len(pending)} to render on {workers} workers")
+
+    results = {job_id: dict(result, resumed=True) for job_id, result in finished.items()}
+    start = time.perf_counter()
+    context = multiprocessing.get_context('spawn')  # SDL state must not be forked
+    with open(journal_path, 'a') as journal, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                initializer=init_worker) as pool:
+        futures = {pool.submit(render_job, job, fps, max_time): job for job in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {'id': job['id'], 'output': job['output'], 'seed': job['seed'],
+                          'status': 'failed', 'error': f"{type(e).__name__}: {str(e)}"}
+            results[job['id']] = result
+
+            journal.write(json.dumps(result) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+
+            if result['status'] == 'ok':
+                print(f"[{done}/{len(pending)}] {job['id']}: {result['frames']} frames "
+                      f"in {result['total_time']:.1f}s ({result['fps']:.1f} fps)")
+            else:
+                print(f"[{done}/{len(pending)}] {job['id']} failed: {result.get('error', 'no output')}")
+    elapsed = time.perf_counter() - start
+
+    ordered = [results[job['id']] for job in jobs if job['id'] in results]
+    summary = {
+        'manifest': manifest_path,
+        'workers': workers,
+        'wall_time': elapsed,
+        'jobs': len(jobs),
+        'ok': sum(1 for r in ordered if r['status'] == 'ok'),
+        'failed': sum(1 for r in ordered if r['status'] != 'ok'),
+        'resumed': sum(1 for r in ordered if r.get('resumed')),
+        'results': ordered,
+    }
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"Batch finished in {elapsed:.1f}s: {summary['ok']} ok, {summary['failed']} failed, "
+          f"{summary['resumed']} resumed. Summary written to {summary_path}")
+    return summary
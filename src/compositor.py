@@ -0,0 +1,199 @@
+import pygame
+from typing import List, Optional, Tuple
+from src.entities.ring import get_pixel_rows
+
+class RingLayer:
+    """The game's rings painted on a persistent surface, kept up to date frame by frame.
+
+    Where ring strokes do not share pixels, each frame only repaints the
+    runs of each ring that its rotation or destruction changed. Where they
+    overlap, RingSet.draw_delta rewrites the pixels in or under a gap.
+    Both renderers keep one: Compositor blits it to the screen by dirty
+    rects, TextureRenderer uploads the changed area to a texture.
+    """
+
+    def __init__(self, game, surface: pygame.Surface, background: Tuple[int, ...]):
+        self.game = game
+        self.surface = surface
+        self.background = background  # Fill of pixels no ring covers
+        self.clear_color = surface.map_rgb(background)
+
+    def overlapping(self) -> bool:
+        """Whether neighbouring ring strokes share pixels"""
+        return self.game.config.spacing < self.game.config.thickness
+
+    def rebuild(self):
+        """Repaint every ring from scratch"""
+        self.surface.fill(self.background)
+        pixels = get_pixel_rows(self.surface)
+        if self.overlapping():
+            self.game.rings.drawn_hidden = None
+            if pixels is None:
+                self.game.rings.draw(self.surface)
+            else:
+                self.game.rings.draw_delta(self.surface, pixels, self.clear_color)
+        else:
+            for ring in self.game.rings:
+                ring.drawn_runs = None
+                ring.draw_delta(self.surface, pixels, self.clear_color)
+        del pixels
+
+    def update(self) -> List[pygame.Rect]:
+        """Bring the layer up to date and return the rects that changed"""
+        if self.overlapping():
+            # Hiding one ring's pixels could uncover its neighbour, so the rings are updated together
+            outer = self.game.rings.radius.max(initial=0) + 1
+            center = self.game.center
+            area = pygame.Rect(int(center.x - outer), int(center.y - outer),
+                               int(outer * 2) + 2, int(outer * 2) + 2)
+            pixels = get_pixel_rows(self.surface)
+            if pixels is None:
+                self.surface.fill(self.background, area)
+                self.game.rings.draw(self.surface)
+            else:
+                self.game.rings.draw_delta(self.surface, pixels, self.clear_color)
+            del pixels
+            return [area]
+
+        rects = []
+        pixels = get_pixel_rows(self.surface)
+        for ring in self.game.rings:
+            rects.extend(ring.draw_delta(self.surface, pixels, self.clear_color))
+        del pixels
+        return rects
+
+class Compositor:
+    """Layered dirty-rectangle renderer for Game.draw.
+
+    Layers, bottom to top:
+      static  - the background fill
+      rings   - a RingLayer, updated only where ring gaps moved
+      dynamic - particles and the ball, drawn straight to the screen
+      overlay - the start/win text, rendered once per message
+    Each frame only the rects that changed are restored from the layers
+    and presented with pygame.display.update(rects). While a background
+    video is playing every pixel changes, so the game's full redraw and
+    display.flip() are used instead.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.screen = game.screen
+        self.screen_rect = self.screen.get_rect()
+        self.static: Optional[pygame.Surface] = None
+        self.rings: Optional[pygame.Surface] = None
+        self.ring_layer: Optional[RingLayer] = None
+        self.valid = False
+        self.previous_dynamic: List[pygame.Rect] = []
+        self.overlay_text = None
+        self.overlay_rect: Optional[pygame.Rect] = None
+
+        # Fraction of the screen presented each frame
+        self.frames = 0
+        self.fraction_total = 0.0
+        self.fraction_last = 0.0
+        self.fraction_max = 0.0
+
+    def rebuild_layers(self):
+        """Redraw the static and ring layers from scratch"""
+        if self.static is None:
+            self.static = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            self.rings = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            self.rings.set_colorkey((0, 0, 0))
+            self.ring_layer = RingLayer(self.game, self.rings, (0, 0, 0))
+        self.static.fill((0, 0, 0))
+        self.ring_layer.rebuild()
+
+    def get_dynamic_rects(self) -> List[pygame.Rect]:
+        rects = self.game.get_ball_bounds()
+        particle_rect = self.game.particles.get_bounds()
+        if particle_rect is not None:
+            rects.append(particle_rect)
+        if self.game.profiler is not None:
+            rects.extend(self.game.profiler.get_bounds())
+        return rects
+
+    def update_overlay(self) -> List[pygame.Rect]:
+        """Re-render the overlay text if the message changed; return the rects it touched"""
+        text = self.game.get_overlay_text()
+        if text == self.overlay_text:
+            return []
+        rects = [self.overlay_rect] if self.overlay_rect is not None else []
+        self.overlay_text = text
+        self.overlay_rect = self.game.render_overlay()[1] if text is not None else None
+        if self.overlay_rect is not None:
+            rects.append(self.overlay_rect)
+        return rects
+
+    def merge_rects(self, rects: List[pygame.Rect]) -> List[pygame.Rect]:
+        """Clip rects to the screen and union the ones that overlap"""
+        merged: List[pygame.Rect] = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            # Absorb every merged rect this one touches, repeating as it grows
+            hit = rect.collidelist(merged)
+            while hit != -1:
+                rect.union_ip(merged.pop(hit))
+                hit = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def record_fraction(self, rects: List[pygame.Rect]):
+        area = sum(rect.width * rect.height for rect in rects)
+        fraction = min(1.0, area / (self.screen_rect.width * self.screen_rect.height))
+        self.frames += 1
+        self.fraction_total += fraction
+        self.fraction_last = fraction
+        self.fraction_max = max(self.fraction_max, fraction)
+
+    def draw(self):
+        if self.game.bg_frame is not None:
+            # Every pixel of a video frame changes, so dirty rects cannot save anything
+            self.game.draw_full()
+            self.valid = False
+            self.record_fraction([self.screen_rect])
+            return
+
+        if not self.valid:
+            self.rebuild_layers()
+            self.update_overlay()
+            dirty = [self.screen_rect.copy()]
+            self.valid = True
+        else:
+            dirty = self.ring_layer.update() + self.update_overlay()
+
+        current_dynamic = self.get_dynamic_rects()
+        dirty = self.merge_rects(dirty + self.previous_dynamic + current_dynamic)
+        self.previous_dynamic = current_dynamic
+
+        # Restore the dirty areas from the layers, then draw what moves on top
+        for rect in dirty:
+            self.screen.blit(self.static, rect, rect)
+            self.screen.blit(self.rings, rect, rect)
+        self.game.particles.draw(self.screen)
+        self.game.draw_balls()
+
+        if self.overlay_rect is not None:
+            overlay, overlay_rect = self.game.render_overlay()
+            for rect in dirty:
+                area = rect.clip(overlay_rect)
+                if area.width > 0 and area.height > 0:
+                    self.screen.blit(overlay, area, area.move(-overlay_rect.x, -overlay_rect.y))
+        if self.game.profiler is not None:
+            self.game.profiler.draw(self.screen)
+            self.game.profiler.count('dirty_rects', len(dirty))
+        self.game.lap('draw')
+
+        pygame.display.update(dirty)
+        self.game.lap('flip')
+        self.record_fraction(dirty)
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'mean_fraction': self.fraction_total / self.frames if self.frames else 0.0,
+            'last_fraction': self.fraction_last,
+            'max_fraction': self.fraction_max,
+        }
@@ -1,25 +1,112 @@
-# Configuration variables
-CONFIG = {
-    'width': 720,         # Window width
-    'height': 1280,       # Window height
-    'rings': 25,          # Number of rings
-    'rotation': 1.5,      # Base rotation speed
-    'ball_speed': 750,    # Initial ball speed
-    'offset': 0.1,        # Rotation offset between rings
-    'grow': True,         # Whether ball grows on collision
-    'grow_size': 0.005,   # How much the ball grows on collision (pixels)
-    'thickness': 2,       # Ring thickness
-    'spacing': 15,        # Spacing between rings
-    'gap_size': .75,      # Gap size in radians (0.25 = PI/4 = 45 degrees)
-    'max_ring_radius': 0, # Will be calculated based on window size
-    'gravity': 0.0,       # Gravity affecting the ball (pixels/s²)
-    'use_icon': True,     # Whether to use icon.png instead of circle
-    'icon_size': 64,      # Size of the icon in pixels (both width and height)
-    'bg_opacity': 0.5,    # Background video opacity (0.0 to 1.0)
-    'tumble': True,       # Whether the ball/icon should spin when bouncing
-    'tumble_velocity': 720.0,  # Degrees per second for tumbling
-    'minimum_bounce_angle': 20.0,  # Minimum angle (in degrees) for bounces to prevent rolling
-}
-
-# Calculate maximum ring radius to fit window
-CONFIG['max_ring_radius'] = min(CONFIG['width'], CONFIG['height']) * 0.45 
\ No newline at end of file
+import dataclasses
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict
+
+# Drawing backends: software Surface blits, or pygame._sdl2 Renderer/Texture draws
+RENDERERS = ('surface', 'texture')
+
+@dataclass(frozen=True)
+class GameConfig:
+    """Settings for one Game, frozen when the game is created.
+
+    Each Game, BatchSimulation and BallSwarm reads its own snapshot, so
+    games built from different settings never see each other's values.
+    Hot code binds the fields it needs to attributes up front. Indexing
+    (config['rings']) still works for code written against the CONFIG dict.
+    """
+    width: int = 720          # Window width
+    height: int = 1280        # Window height
+    rings: int = 25           # Number of rings
+    rotation: float = 1.5     # Base rotation speed
+    ball_speed: float = 750   # Initial ball speed
+    offset: float = 0.1       # Rotation offset between rings
+    grow: bool = True         # Whether ball grows on collision
+    grow_size: float = 0.005  # How much the ball grows on collision (pixels)
+    thickness: int = 2        # Ring thickness
+    gap_size: float = .75     # Gap size in radians (0.25 = PI/4 = 45 degrees)
+    max_ring_radius: float = 0  # 0 to fit the window (see __post_init__)
+    gravity: float = 0.0      # Gravity affecting the ball (pixels/s²)
+    use_icon: bool = True     # Whether to use icon.png instead of circle
+    icon_size: int = 64       # Size of the icon in pixels (both width and height)
+    icon_rotation_steps: int = 360  # Pre-rotated icon variants built at load
+    video_background: bool = True  # Play bg.mp4 behind the rings when it exists
+    bg_opacity: float = 0.5   # Background video opacity (0.0 to 1.0)
+    bg_cache: bool = True     # Pre-render bg.mp4 to a frame cache; otherwise decode it on a thread
+    bg_buffer_frames: int = 8  # Frames the background decoder thread may run ahead
+    tumble: bool = True       # Whether the ball/icon should spin when bouncing
+    tumble_velocity: float = 720.0  # Degrees per second for tumbling
+    minimum_bounce_angle: float = 20.0  # Minimum angle (in degrees) for bounces to prevent rolling
+    swept_collisions: bool = True      # Solve exact ring impact times instead of end-of-frame checks
+    balls: int = 1                     # Balls sharing the rings; more than one are simulated as arrays
+    destruction_particles: int = 100   # Particles burst from each destroyed ring
+    sprite_cache_size: int = 4096      # Max pre-rendered circle sprites kept (LRU)
+    sprite_radius_step: float = 0.5    # Sprite radius quantization (pixels)
+    sprite_alpha_levels: int = 32      # Number of distinct sprite alpha values
+    dirty_rects: bool = True           # Redraw only changed screen areas (full redraw under a video)
+    renderer: str = 'surface'          # 'surface' for software blits, 'texture' for SDL Renderer/Texture draws
+    audio: bool = True                 # Open the mixer and load sounds; off is silent, with no recorded track
+    snippet_cache_size: int = 16       # Song snippet Sounds kept alive (LRU)
+    cache_dir: str = '.cache'          # Decoded song PCM and background video frames, memory-mapped
+    outer_ring_radius: float = field(init=False, default=0.0)  # max_ring_radius, or the window fit, derived
+    spacing: float = field(init=False, default=0.0)  # Distance between rings, derived
+
+    def __post_init__(self):
+        if self.renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer {self.renderer!r}; expected one of {', '.join(RENDERERS)}")
+        # Derived values; the dataclass is frozen, so set them through object.
+        # max_ring_radius keeps what was asked for, so 0 still means "fit the window" in copies
+        outer_ring_radius = self.max_ring_radius
+        if outer_ring_radius <= 0:
+            outer_ring_radius = min(self.width, self.height) * 0.45
+        object.__setattr__(self, 'outer_ring_radius', outer_ring_radius)
+        object.__setattr__(self, 'spacing', (outer_ring_radius - 50) / self.rings)
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> 'GameConfig':
+        """Build from a CONFIG-style dict; derived keys in it are recomputed"""
+        fields = dataclasses.fields(cls)
+        unknown = set(values) - {f.name for f in fields}
+        if unknown:
+            raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+        return cls(**{f.name: values[f.name] for f in fields if f.init and f.name in values})
+
+    def replace(self, **changes) -> 'GameConfig':
+        """A copy with changes applied; derived fields are recomputed"""
+        return dataclasses.replace(self, **changes)
+
+    def as_dict(self) -> Dict:
+        return dataclasses.asdict(self)
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+# Defaults the command-line tools override before creating a Game; each Game
+# copies it into a GameConfig, so changing it never affects a running game
+CONFIG = GameConfig().as_dict()
+
+def snapshot_config() -> GameConfig:
+    """CONFIG as it is now, frozen"""
+    return GameConfig.from_dict(CONFIG)
+
+def resolve_config(overrides: Dict) -> GameConfig:
+    """CONFIG with overrides applied, without touching the global"""
+    values = dict(CONFIG)
+    values.update(overrides)
+    return GameConfig.from_dict(values)
+
+# Keys that change the simulated trajectory; everything else only affects how it looks
+SIMULATION_KEYS = [
+    'width', 'height', 'rings', 'rotation', 'ball_speed', 'offset', 'grow', 'grow_size',
+    'thickness', 'gap_size', 'outer_ring_radius', 'gravity', 'use_icon', 'icon_size',
+    'tumble', 'tumble_velocity', 'minimum_bounce_angle', 'swept_collisions',
+    'balls',
+]
+
+def config_fingerprint(config=None) -> bytes:
+    """8-byte hash of the simulation-relevant config values"""
+    if config is None:
+        config = snapshot_config()  # Derived values in the CONFIG dict may predate later edits to it
+    values = json.dumps({key: config[key] for key in SIMULATION_KEYS}, sort_keys=True)
+    return hashlib.sha1(values.encode()).digest()[:8]
@@ -1,5 +1,7 @@
 from .ball import Ball
 from .ring import Ring
-from .particle import Particle
+from .ring_set import RingSet
+from .particle_system import ParticleSystem
+from .ball_swarm import BallSwarm
 
-__all__ = ['Ball', 'Ring', 'Particle'] 
\ No newline at end of file
+__all__ = ['Ball', 'Ring', 'RingSet', 'ParticleSystem', 'BallSwarm'] 
\ No newline at end of file
@@ -1,19 +1,32 @@
 from src.utils.vector import Vector2
-from src.config import CONFIG
+from src.config import GameConfig, snapshot_config
 import pygame
-import random
 import math
-from typing import List, Tuple
-from src.entities.ring import Ring
+from collections import deque
+from typing import Deque, List
+from src.utils.sprite_cache import SpriteCache
+from src.utils.rotation_atlas import RotationAtlas
+from src.utils.rng import SeededRandom
 
 class Ball:
-    def __init__(self, pos: Vector2, radius: float):
-        self.pos = pos
-        self.vel = Vector2(random.uniform(-1, 1), 
-                          random.uniform(-1, 1)).normalize() * CONFIG['ball_speed']
+    def __init__(self, pos: Vector2, radius: float, sprite_cache: SpriteCache = None,
+                 rng: SeededRandom = None, config: GameConfig = None):
+        config = config if config is not None else snapshot_config()
+        # Settings read on every bounce or step
+        self.ball_speed = config.ball_speed
+        self.minimum_bounce_angle = config.minimum_bounce_angle
+        self.tumble = config.tumble
+        self.tumble_velocity = config.tumble_velocity
+        self.grow_size = config.grow_size if config.grow else 0.0
+        self.gravity = config.gravity
+        
+        self.pos = pos.copy()  # Moved in place, so never share the caller's vector
+        self.rng = rng if rng is not None else SeededRandom()
+        self.vel = Vector2(self.rng.uniform(-1, 1), 
+                          self.rng.uniform(-1, 1)).normalize() * self.ball_speed
         self.radius = radius
         self.base_radius = radius
-        self.trail: List[Tuple[Vector2, float, float]] = []
+        self.trail: Deque[list] = deque()  # [pos, alpha, rotation], newest first
         self.trail_length = 5
         self.restitution = 0.98
         self.rotation = 0.0
@@ -21,27 +34,33 @@ class Ball:
         self.last_bounce_pos = None
         self.consecutive_bounces = 0
         self.last_bounce_time = 0
+        self.sim_time = 0.0  # Simulated seconds, advanced by update()
+        self.sprite_cache = sprite_cache if sprite_cache is not None else SpriteCache()
         
-        # Try to load the icon if enabled
-        self.icon = None
-        if CONFIG['use_icon']:
+        # The icon sets the ball's size, so it is loaded here; its rotations are built on first draw
+        self.icon_atlas = None
+        if config.use_icon:
             try:
-                self.icon = pygame.image.load('icon.png').convert_alpha()
-                icon_size = CONFIG['icon_size']
-                self.icon = pygame.transform.smoothscale(self.icon, (icon_size, icon_size))
-                self.radius = icon_size / 2
+                icon = pygame.image.load('icon.png')
+                if pygame.display.get_surface() is not None:
+                    # No display to match under the texture renderer, which uploads it as is
+                    icon = icon.convert_alpha()
+                icon = pygame.transform.smoothscale(icon, (config.icon_size, config.icon_size))
+                self.icon_atlas = RotationAtlas(icon, config.icon_rotation_steps)
+                self.radius = config.icon_size / 2
                 self.base_radius = self.radius
             except:
                 print("Warning: Could not load icon.png, falling back to circle")
-                CONFIG['use_icon'] = False
     
     def is_edge_rolling(self, normal: Vector2) -> bool:
         """Detect if the ball is rolling along an edge"""
-        current_time = pygame.time.get_ticks() / 1000.0
+        current_time = self.sim_time
         
         # Check if this bounce is very close to the last bounce
         if self.last_bounce_pos is not None:
-            distance_to_last = (self.pos - self.last_bounce_pos).length()
+            offset_x = self.pos.x - self.last_bounce_pos.x
+            offset_y = self.pos.y - self.last_bounce_pos.y
+            distance_to_last = math.sqrt(offset_x * offset_x + offset_y * offset_y)
             time_since_last = current_time - self.last_bounce_time
             
             if distance_to_last < self.radius * 4 and time_since_last < 0.1:
@@ -49,7 +68,10 @@ class Ball:
             else:
                 self.consecutive_bounces = 0
         
-        self.last_bounce_pos = Vector2(self.pos.x, self.pos.y)
+        if self.last_bounce_pos is None:
+            self.last_bounce_pos = self.pos.copy()
+        else:
+            self.last_bounce_pos.update(self.pos.x, self.pos.y)
         self.last_bounce_time = current_time
         
         return self.consecutive_bounces >= 2
@@ -60,39 +82,43 @@ class Ball:
         perpendicular = Vector2(-normal.y, normal.x)
         
         # Add a strong outward component and some randomness
-        escape_angle = math.radians(random.uniform(30, 60))
+        escape_angle = math.radians(self.rng.uniform(30, 60))
         escape_dir = Vector2(
             normal.x * math.cos(escape_angle) + perpendicular.x * math.sin(escape_angle),
             normal.y * math.cos(escape_angle) + perpendicular.y * math.sin(escape_angle)
         )
         
-        return escape_dir.normalize()
+        escape_dir.normalize_ip()
+        return escape_dir
     
     def bounce(self, normal: Vector2):
         if self.is_edge_rolling(normal):
             # If we detect edge rolling, use escape vector
             escape_dir = self.get_escape_vector(normal)
-            self.vel = escape_dir * (CONFIG['ball_speed'] * 1.2)  # Slightly faster to ensure escape
+            escape_dir *= self.ball_speed * 1.2  # Slightly faster to ensure escape
+            self.vel = escape_dir
             self.consecutive_bounces = 0
         else:
             # Regular bounce logic with improved angle handling
             dot_product = self.vel.x * normal.x + self.vel.y * normal.y
             bounce_angle = math.degrees(math.acos(max(-1.0, min(1.0, dot_product / self.vel.length()))))
                         
-            if bounce_angle < CONFIG['minimum_bounce_angle']:
+            if bounce_angle < self.minimum_bounce_angle:
                 # More aggressive angle adjustment for shallow bounces
                 perpendicular = Vector2(-normal.y, normal.x)
                 sign = 1 if self.vel.x * perpendicular.x + self.vel.y * perpendicular.y > 0 else -1
-                min_angle_rad = math.radians(CONFIG['minimum_bounce_angle'] + random.uniform(10, 25))
+                min_angle_rad = math.radians(self.minimum_bounce_angle + self.rng.uniform(10, 25))
                 
                 new_dir = Vector2(
                     normal.x * math.cos(min_angle_rad) + sign * perpendicular.x * math.sin(min_angle_rad),
                     normal.y * math.cos(min_angle_rad) + sign * perpendicular.y * math.sin(min_angle_rad)
                 )
-                self.vel = new_dir.normalize() * (CONFIG['ball_speed'] * random.uniform(1.0, 1.2))
+                new_dir.normalize_ip()
+                new_dir *= self.ball_speed * self.rng.uniform(1.0, 1.2)
+                self.vel = new_dir
             else:
                 # Add more randomness for shallow angles
-                random_angle = (random.uniform(-15, 15) if bounce_angle < 45 or bounce_angle > 135 else random.uniform(-5, 5))
+                random_angle = (self.rng.uniform(-15, 15) if bounce_angle < 45 or bounce_angle > 135 else self.rng.uniform(-5, 5))
 
                 # Regular bounce with added randomness
                 rot_angle = math.radians(random_angle)
@@ -112,44 +138,35 @@ class Ball:
                 #    self.vel.y - 2 * dot_product * rotated_normal.y
                 #)
 
-                speed = self.vel.length() * random.uniform(0.95, 1.05)
-                self.vel = rotated_normal 
+                speed = self.vel.length() * self.rng.uniform(0.95, 1.05)
                 
                 # Ensure minimum velocity and add some randomness
-                self.vel = self.vel.normalize() * max(speed, CONFIG['ball_speed'] * 0.8)
+                rotated_normal.normalize_ip()
+                rotated_normal *= max(speed, self.ball_speed * 0.8)
+                self.vel = rotated_normal
         
         # Apply tumble if enabled
-        if CONFIG['tumble']:
-            tumble_direction = random.choice([-1, 1])  # Randomize tumble direction
-            random_multiplier = random.uniform(0.8, 1.2)
-            self.angular_velocity = CONFIG['tumble_velocity'] * tumble_direction * random_multiplier
+        if self.tumble:
+            tumble_direction = self.rng.choice([-1, 1])  # Randomize tumble direction
+            random_multiplier = self.rng.uniform(0.8, 1.2)
+            self.angular_velocity = self.tumble_velocity * tumble_direction * random_multiplier
     
     def grow(self):
-        if CONFIG['grow']:
-            self.radius += CONFIG['grow_size']
+        if self.grow_size:
+            self.radius += self.grow_size
     
-    def update(self, dt: float, active_ring: Ring = None):
-        if CONFIG['gravity'] != 0.0:
-            self.vel.y += CONFIG['gravity'] * dt
-        
-        #if active_ring != None:
-        #    print(self.pos, self.pos - active_ring.center, self.vel, dt)
-        #else:
-        #    print(self.pos, self.pos, self.vel, dt)
-
-        self.pos += self.vel * dt
-             
-        if active_ring != None:
-            # check pos w.r.t. active ring
-            ball_to_center = self.pos - active_ring.center
-            ball_distance = ball_to_center.length()
-            if ball_distance > active_ring.radius:
-                # correct position
-                angle = math.atan2(ball_to_center.y, ball_to_center.x)
-                self.pos.x = math.cos(angle) * ball_distance + active_ring.center.x
-                self.pos.y = math.sin(angle) * ball_distance + active_ring.center.y
-                print(f"Fixing position")
-
+    def apply_gravity(self, dt: float):
+        if self.gravity != 0.0:
+            self.vel.y += self.gravity * dt
+    
+    def update(self, dt: float):
+        self.sim_time += dt
+        self.apply_gravity(dt)
+        self.pos.add_scaled_ip(self.vel, dt)
+        self.update_spin(dt)
+    
+    def update_spin(self, dt: float):
+        """Advance the tumble rotation and the trail by dt"""
         # Update rotation
         self.rotation += self.angular_velocity * dt
         # Keep rotation between 0 and 360 degrees
@@ -158,40 +175,54 @@ class Ball:
         # Gradually reduce angular velocity
         self.angular_velocity *= 0.99
         
-        # Add current position and rotation to trail
-        self.trail.insert(0, (Vector2(self.pos.x, self.pos.y), 0.4, self.rotation))
-        if len(self.trail) > self.trail_length:
-            self.trail.pop()
+        # Add current position and rotation to trail, recycling the oldest entry once it is full
+        if len(self.trail) >= self.trail_length:
+            entry = self.trail.pop()
+            entry[0].update(self.pos.x, self.pos.y)
+            entry[1] = 0.4
+            entry[2] = self.rotation
+        else:
+            entry = [self.pos.copy(), 0.4, self.rotation]
+        self.trail.appendleft(entry)
         
-        for i in range(len(self.trail)):
-            pos, alpha, rot = self.trail[i]
-            self.trail[i] = (pos, max(0, alpha - dt * 2), rot)
+        for entry in self.trail:
+            entry[1] = max(0, entry[1] - dt * 2)
     
     def draw(self, screen: pygame.Surface):
+        icon_atlas = self.icon_atlas
         for pos, alpha, rotation in self.trail:
-            if not CONFIG['use_icon'] or not self.icon:
+            if icon_atlas is None:
                 # Draw regular circle trail
-                radius = self.radius * alpha
-                color = (255, 255, 255, int(255 * alpha))
-                surf = pygame.Surface((int(radius * 2), int(radius * 2)), pygame.SRCALPHA)
-                pygame.draw.circle(surf, color, (radius, radius), radius)
-                screen.blit(surf, (int(pos.x - radius), int(pos.y - radius)))
+                surf = self.sprite_cache.circle(self.radius * alpha, (255, 255, 255), 255 * alpha)
+                half_size = surf.get_width() / 2
+                screen.blit(surf, (int(pos.x - half_size), int(pos.y - half_size)))
             else:
                 # Draw rotating icon trail with transparency
-                scaled_icon = self.icon.copy()
-                scaled_icon.set_alpha(int(255 * alpha))
-                # Rotate the trail icon
-                rotated_icon = pygame.transform.rotate(scaled_icon, rotation)
-                icon_rect = rotated_icon.get_rect(center=(pos.x, pos.y))
-                screen.blit(rotated_icon, icon_rect)
+                icon_atlas.blit(screen, rotation, (pos.x, pos.y), int(255 * alpha))
         
-        if not CONFIG['use_icon'] or not self.icon:
+        if icon_atlas is None:
             # Draw regular circle ball
             pygame.draw.circle(screen, (255, 255, 255), 
                              (int(self.pos.x), int(self.pos.y)), 
                              int(self.radius))
         else:
             # Draw rotated icon ball
-            rotated_icon = pygame.transform.rotate(self.icon, self.rotation)
-            icon_rect = rotated_icon.get_rect(center=(self.pos.x, self.pos.y))
-            screen.blit(rotated_icon, icon_rect)
\ No newline at end of file
+            icon_atlas.blit(screen, self.rotation, (self.pos.x, self.pos.y))
+
+    def get_bounds(self) -> List[pygame.Rect]:
+        """Screen rects covered by the ball and its trail as of the last update"""
+        rects = []
+        icon_atlas = self.icon_atlas
+        if icon_atlas is None:
+            for pos, alpha, rotation in self.trail:
+                radius = self.radius * alpha + 1
+                rects.append(pygame.Rect(int(pos.x - radius), int(pos.y - radius),
+                                         int(radius * 2) + 2, int(radius * 2) + 2))
+            radius = int(self.radius) + 1
+            rects.append(pygame.Rect(int(self.pos.x) - radius, int(self.pos.y) - radius,
+                                     radius * 2 + 1, radius * 2 + 1))
+        else:
+            for pos, alpha, rotation in self.trail:
+                rects.append(icon_atlas.get(rotation)[1].move(round(pos.x), round(pos.y)))
+            rects.append(icon_atlas.get(self.rotation)[1].move(round(self.pos.x), round(self.pos.y)))
+        return rects
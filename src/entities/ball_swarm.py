@@ -0,0 +1,130 @@
+import math
+import numpy as np
+import pygame
+from typing import Dict, List, Tuple, Union
+from src.config import GameConfig
+from src.entities.ring_set import RingSet
+from src.simulation import BatchSimulation
+from src.utils.collision import times_to_reach_radius, MAX_IMPACTS_PER_STEP
+from src.utils.rng import MASK64, splitmix64_array
+from src.utils.sprite_cache import SpriteCache
+
+class BallSwarm(BatchSimulation):
+    """Many balls inside one shared set of rings, stepped and collided as arrays.
+
+    Each ball is a row of BatchSimulation's arrays with its own random
+    stream, its own bounce state and its own innermost active ring. The
+    rings are shared: the first ball through a ring's gap destroys it for
+    everyone, and balls that were inside it move on to the next ring still
+    standing. Balls that escape every ring keep flying.
+
+    The rings' rotation is the RingSet's own array, turned by RingSet.update
+    before each step, so the swarm collides against the rings as drawn.
+    """
+
+    record_destroy_times = False  # Rings are shared, so one ball's destroy times say little
+
+    def __init__(self, count: int, seed: int, rings: RingSet,
+                 sprite_cache: SpriteCache = None, config: Union[GameConfig, Dict] = None,
+                 ball_radius: float = None):
+        # One stream per ball, all derived from the game's seed
+        seeds = splitmix64_array(np.arange(count, dtype=np.uint64) + np.uint64(seed & MASK64))
+        super().__init__(seeds.tolist(), config, ball_radius)
+        self.count = count
+        self.ring_rotation = rings.rotation
+        self.ring_speed = rings.speed
+        self.ring_destroyed = np.zeros(len(self.ring_radius), dtype=bool)
+        # next_alive[i]: the first ring at or outside i still standing
+        self.next_alive = np.arange(len(self.ring_radius) + 1)
+
+        # Launch in random directions rather than all straight up
+        angle = self.uniform(np.arange(count), 0, 2 * math.pi)
+        self.vel_x = np.cos(angle) * self.config.ball_speed
+        self.vel_y = np.sin(angle) * self.config.ball_speed
+
+        self.colors = list(rings.colors)
+        self.color_index = np.arange(count) % len(self.colors)
+        self.sprite_cache = sprite_cache if sprite_cache is not None else SpriteCache()
+
+    def destroy_rings(self, rings: np.ndarray) -> List[int]:
+        """Mark rings destroyed; returns the ones that were still standing"""
+        rings = np.unique(rings[~self.ring_destroyed[rings]])
+        if rings.size:
+            self.ring_destroyed[rings] = True
+            ring_count = len(self.ring_radius)
+            standing = np.where(self.ring_destroyed, ring_count, np.arange(ring_count))
+            self.next_alive[:ring_count] = np.minimum.accumulate(standing[::-1])[::-1]
+        return rings.tolist()
+
+    def step(self, dt: float) -> Tuple[List[int], int]:
+        """Advance every ball by dt; returns the rings destroyed and the number of bounces"""
+        balls = np.arange(self.count)
+        self.frames += 1
+        if self.config.gravity != 0.0:
+            self.vel_y += self.config.gravity * dt
+
+        destroyed = []
+        bounces = 0
+        remaining = np.full(self.count, dt)
+        thickness = self.config.thickness
+        for _ in range(MAX_IMPACTS_PER_STEP):
+            balls = balls[self.active_ring[balls] < len(self.ring_radius)]
+            if balls.size == 0:
+                break
+            ring = self.active_ring[balls]
+            contact_radius = self.ring_radius[ring] - (self.radius[balls] + thickness)
+            t = times_to_reach_radius(self.pos_x[balls] - self.center_x, self.pos_y[balls] - self.center_y,
+                                      self.vel_x[balls], self.vel_y[balls], contact_radius, remaining[balls])
+            hit = ~np.isnan(t)
+            balls, ring, t = balls[hit], ring[hit], t[hit]
+            if balls.size == 0:
+                break
+
+            self.pos_x[balls] += self.vel_x[balls] * t
+            self.pos_y[balls] += self.vel_y[balls] * t
+            self.ball_time[balls] += t
+            remaining[balls] -= t
+
+            angle = np.arctan2(self.center_y - self.pos_y[balls], self.pos_x[balls] - self.center_x) % self.two_pi
+            rotation = self.ring_rotation[ring] - self.ring_speed[ring] * remaining[balls]
+            normalized = (angle - rotation) % self.two_pi
+            in_gap = (normalized <= self.gap_low) | (normalized >= self.gap_high)
+
+            escaped = balls[in_gap]
+            destroyed += self.destroy_rings(ring[in_gap])
+            self.active_ring[escaped] = ring[in_gap] + 1
+            # Rings a ball just destroyed no longer hold anyone in
+            self.active_ring = self.next_alive[self.active_ring]
+            self.bounce(balls[~in_gap])
+            bounces += int(np.count_nonzero(~in_gap))
+
+        self.pos_x += self.vel_x * remaining
+        self.pos_y += self.vel_y * remaining
+        self.ball_time += remaining
+        self.won = self.active_ring >= len(self.ring_radius)
+        return destroyed, bounces
+
+    def draw(self, screen: pygame.Surface):
+        """Blit every ball as a cached circle sprite in one batched call"""
+        cache = self.sprite_cache
+        radius_index = np.maximum(1, np.rint(self.radius / cache.radius_step)).astype(np.int64)
+        keys = (self.color_index << 32) | radius_index
+
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sprites = np.empty(len(unique_keys), dtype=object)
+        sprites[:] = [cache.get_circle(int(radius_index[i]), self.colors[self.color_index[i]],
+                                       cache.alpha_levels - 1)
+                      for i in first]
+        half_size = np.array([sprite.get_width() / 2 for sprite in sprites])[inverse]
+        left = (self.pos_x - half_size).astype(np.int64)
+        top = (self.pos_y - half_size).astype(np.int64)
+        screen.blits(zip(sprites[inverse], zip(left.tolist(), top.tolist())), doreturn=False)
+
+    def get_bounds(self) -> pygame.Rect:
+        """One rect covering every ball sprite"""
+        margin = math.ceil(self.radius.max() + self.sprite_cache.radius_step) + 1
+        left = math.floor(self.pos_x.min()) - margin
+        top = math.floor(self.pos_y.min()) - margin
+        right = math.ceil(self.pos_x.max()) + margin
+        bottom = math.ceil(self.pos_y.max()) + margin
+        return pygame.Rect(left, top, right - left, bottom - top)
@@ -0,0 +1,119 @@
+import math
+import numpy as np
+import pygame
+from typing import Tuple
+from src.utils.sprite_cache import SpriteCache
+
+class ParticleSystem:
+    """All live particles stored as arrays and updated in one vectorized step.
+
+    Used for ring destruction bursts; each row is one particle, which
+    drifts with a slight deceleration until its lifetime runs out.
+    """
+
+    def __init__(self, capacity: int = 1024, rng: np.random.Generator = None,
+                 sprite_cache: SpriteCache = None):
+        self.count = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.radius = np.zeros(capacity)
+        self.sprite_cache = sprite_cache if sprite_cache is not None else SpriteCache()
+
+    def reserve(self, extra: int):
+        """Grow the arrays so another `extra` particles fit"""
+        needed = self.count + extra
+        capacity = len(self.lifetime)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('pos', 'vel', 'lifetime', 'max_lifetime', 'color', 'radius'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def emit_ring(self, center: Tuple[float, float], ring_radius: float, count: int,
+                  color: Tuple[int, int, int]):
+        """Burst `count` particles outward from a ring's circumference"""
+        self.reserve(count)
+        start, end = self.count, self.count + count
+
+        angle = self.rng.uniform(0, 2 * math.pi, count)
+        speed = self.rng.uniform(100, 300, count)
+        direction = np.column_stack((np.cos(angle), np.sin(angle)))
+
+        self.pos[start:end] = direction * ring_radius + center
+        self.vel[start:end] = direction * speed[:, None]
+        self.lifetime[start:end] = self.rng.uniform(0.5, 1.5, count)
+        self.max_lifetime[start:end] = self.lifetime[start:end]
+        self.color[start:end] = color
+        self.radius[start:end] = self.rng.uniform(1, 3, count)
+        self.count = end
+
+    def update(self, dt: float):
+        n = self.count
+        if n == 0:
+            return
+
+        self.lifetime[:n] -= dt
+        self.pos[:n] += self.vel[:n] * dt
+        self.vel[:n] *= 0.98  # Add slight deceleration
+
+        # Compact the survivors to the front of the arrays
+        alive = self.lifetime[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for name in ('pos', 'vel', 'lifetime', 'max_lifetime', 'color', 'radius'):
+                array = getattr(self, name)
+                array[:survivors] = array[:n][alive]
+            self.count = survivors
+
+    def quantize(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(radius index, alpha index, color, sprite key) of every live particle.
+
+        Quantized exactly like SpriteCache.quantize, but for every particle at
+        once; particles with equal keys are drawn with the same sprite.
+        """
+        n = self.count
+        cache = self.sprite_cache
+        radius_index = np.maximum(1, np.rint(self.radius[:n] / cache.radius_step)).astype(np.int64)
+        alpha = 255 * (self.lifetime[:n] / self.max_lifetime[:n])
+        alpha_index = np.rint(alpha * (cache.alpha_levels - 1) / 255).astype(np.int64)
+        color = self.color[:n].astype(np.int64)
+        keys = ((color[:, 0] << 40) | (color[:, 1] << 32) | (color[:, 2] << 24)
+                | (radius_index << 12) | alpha_index)
+        return radius_index, alpha_index, color, keys
+
+    def draw(self, screen: pygame.Surface):
+        n = self.count
+        if n == 0:
+            return
+
+        cache = self.sprite_cache
+        radius_index, alpha_index, color, keys = self.quantize()
+
+        # One cache lookup per distinct key, then a single batched blit call
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sprites = np.empty(len(unique_keys), dtype=object)
+        sprites[:] = [cache.get_circle(int(radius_index[i]), tuple(int(c) for c in color[i]),
+                                       int(alpha_index[i]))
+                      for i in first]
+        half_size = np.array([sprite.get_width() / 2 for sprite in sprites])[inverse]
+        topleft = (self.pos[:n] - half_size[:, None]).astype(np.int64)
+        screen.blits(zip(sprites[inverse], topleft.tolist()), doreturn=False)
+
+    def get_bounds(self) -> pygame.Rect:
+        """One rect covering every live particle sprite, or None if there are none"""
+        n = self.count
+        if n == 0:
+            return None
+        # Sprites are at most ceil(2 * quantized radius) wide; pad by that on every side
+        margin = math.ceil(self.radius[:n].max() + self.sprite_cache.radius_step) + 1
+        left, top = np.floor(self.pos[:n].min(axis=0)).astype(int) - margin
+        right, bottom = np.ceil(self.pos[:n].max(axis=0)).astype(int) + margin
+        return pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
@@ -1,39 +1,121 @@
 from src.utils.vector import Vector2
-from src.config import CONFIG
-from src.entities.particle import Particle
+from src.entities.particle_system import ParticleSystem
 import pygame
-import random
 import math
-from typing import List, Tuple
+import numpy as np
+from typing import Dict, List, Tuple
+
+# Screen pixels sorted by distance from a center, shared by every ring around that center
+_polar_tables: Dict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+def get_polar_table(center: Vector2, size: Tuple[int, int]):
+    """Return (index, distance, angle) for all pixels of a surface, sorted by distance.
+
+    index is the pixel's offset in a row-major (y, x) view of the surface.
+    """
+    key = (center.x, center.y, size)
+    table = _polar_tables.get(key)
+    if table is None:
+        width, height = size
+        xs, ys = np.meshgrid(np.arange(width, dtype=np.int16), np.arange(height, dtype=np.int16),
+                             indexing='ij')
+        xs, ys = xs.ravel(), ys.ravel()
+        # Measure from pixel centers; y is flipped because arc angles are measured with y up
+        dx = xs + 0.5 - center.x
+        dy = center.y - (ys + 0.5)
+        distance = np.hypot(dx, dy).astype(np.float32)
+        order = np.argsort(distance, kind='stable')
+        angle = (np.arctan2(dy, dx) % (2 * math.pi)).astype(np.float32)
+        index = ys.astype(np.int32) * width + xs
+        table = (index[order], distance[order], angle[order])
+        _polar_tables[key] = table
+    return table
+
+def get_pixel_rows(screen: pygame.Surface):
+    """Flat, row-major view of a surface's pixels, or None if it cannot be mapped directly.
+
+    The view keeps the surface locked until it is deleted.
+    """
+    if screen.get_bitsize() not in (8, 16, 32):
+        return None
+    pixels = pygame.surfarray.pixels2d(screen).T
+    if not pixels.flags['C_CONTIGUOUS']:
+        return None  # Rows are padded, so there is no flat view
+    return pixels.reshape(-1)
+
+def map_color(surface: pygame.Surface, color: Tuple[int, int, int]) -> int:
+    """surface.map_rgb(color) as an unsigned pixel value; it comes back negative for opaque ARGB"""
+    return surface.map_rgb(color) & 0xFFFFFFFF
+
+def subtract_runs(runs: List[Tuple[int, int]], other: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Parts of the half-open index runs in `runs` not covered by `other`"""
+    result = []
+    for start, end in runs:
+        pieces = [(start, end)]
+        for cut_start, cut_end in other:
+            remaining = []
+            for piece_start, piece_end in pieces:
+                if cut_end <= piece_start or cut_start >= piece_end:
+                    remaining.append((piece_start, piece_end))
+                    continue
+                if piece_start < cut_start:
+                    remaining.append((piece_start, cut_start))
+                if cut_end < piece_end:
+                    remaining.append((cut_end, piece_end))
+            pieces = remaining
+        result.extend(piece for piece in pieces if piece[0] < piece[1])
+    return result
 
 class Ring:
-    def __init__(self, center: Vector2, radius: float, rotation: float, 
-                 gap_size: float, color: Tuple[int, int, int]):
-        self.center = center
-        self.radius = radius
-        self.rotation = rotation
-        self.gap_size = gap_size
-        self.destroyed = False
-        self.particles: List[Particle] = []
-        self.destruction_particles = 100
-        self.color = color
-        self.thickness = CONFIG['thickness']
-        self.gap_tolerance = 0.1
-        self.force_display = False
+    """One ring of a RingSet: its geometry read from the set's arrays, plus its drawing caches"""
+
+    def __init__(self, ring_set, index: int):
+        self.ring_set = ring_set
+        self.index = index
+        self.center = ring_set.center
+        self.thickness = ring_set.thickness
+        self.gap_tolerance = ring_set.gap_tolerance
+        self.destruction_particles = ring_set.destruction_particles
+        self.color = ring_set.colors[index]
         self.two_pi = 2 * math.pi
+        # Pixels of the full stroke sorted by angle, built on first draw
+        self.stroke_index = None
+        self.stroke_angles = None
+        self.drawn_runs = None  # Runs last written by draw_delta
+    
+    @property
+    def radius(self) -> float:
+        return float(self.ring_set.radius[self.index])
+    
+    @property
+    def gap_size(self) -> float:
+        return float(self.ring_set.gap[self.index])
+    
+    @property
+    def rotation(self) -> float:
+        return float(self.ring_set.rotation[self.index])
     
-    def create_destruction_particles(self):
-        for _ in range(self.destruction_particles):
-            angle = random.uniform(0, self.two_pi)
-            speed = random.uniform(100, 300)
-            direction = Vector2(math.cos(angle), math.sin(angle))
-            pos = self.center + direction * self.radius
-            vel = direction * speed
-            lifetime = random.uniform(0.5, 1.5)
-            self.particles.append(Particle(pos, vel, lifetime, self.color))
+    @property
+    def destroyed(self) -> bool:
+        return bool(self.ring_set.destroyed[self.index])
     
-    def is_ball_in_gap(self, ball_angle: float) -> bool:
-        normalized_ball = (ball_angle - self.rotation) % self.two_pi
+    @property
+    def force_display(self) -> bool:
+        return bool(self.ring_set.force_display[self.index])
+    
+    @force_display.setter
+    def force_display(self, value: bool):
+        self.ring_set.force_display[self.index] = value
+    
+    def create_destruction_particles(self, particles: ParticleSystem):
+        particles.emit_ring((self.center.x, self.center.y), self.radius,
+                            self.destruction_particles, self.color)
+    
+    def is_ball_in_gap(self, ball_angle: float, rotation: float = None) -> bool:
+        """Whether an angle falls in the gap, at the current or a given rotation"""
+        if rotation is None:
+            rotation = self.rotation
+        normalized_ball = (ball_angle - rotation) % self.two_pi
         half_gap = self.gap_size / 2
         
         in_main_gap = normalized_ball <= half_gap + self.gap_tolerance or \
@@ -41,39 +123,103 @@ class Ring:
         
         return in_main_gap
     
-    def update(self, dt: float, rotation_speed: float):
-        if not self.destroyed:
-            self.rotation += rotation_speed * dt
-        
-        self.particles = [p for p in self.particles if p.update(dt)]
+    def build_stroke(self, size: Tuple[int, int]):
+        """Rasterize the whole ring once into pixel coordinates sorted by angle"""
+        index, distance, angle = get_polar_table(self.center, size)
+        # The same pixels the stacked one-pixel arcs cover: radius - thickness < d <= radius
+        start, end = np.searchsorted(distance, [self.radius - self.thickness + 0.5, self.radius + 0.5])
+        order = np.argsort(angle[start:end], kind='stable')
+        self.stroke_index = index[start:end][order]
+        self.stroke_angles = angle[start:end][order]
+    
+    def visible_runs(self) -> List[Tuple[int, int]]:
+        """Runs of the angle-sorted stroke that are visible at the current rotation"""
+        if self.destroyed and not self.force_display:
+            return []
+        # The visible arc is a contiguous (wrapping) run of the angle-sorted stroke
+        start_angle = (self.rotation + self.gap_size / 2) % self.two_pi
+        end_angle = start_angle + self.two_pi - self.gap_size
+        start, end = np.searchsorted(self.stroke_angles, [start_angle, end_angle % self.two_pi])
+        if end_angle < self.two_pi:
+            return [(int(start), int(end))]
+        return [(int(start), len(self.stroke_angles)), (0, int(end))]
     
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface, pixels: np.ndarray = None):
+        """Draw the ring; pass get_pixel_rows(screen) to share one surface lock across rings"""
         if not self.destroyed or self.force_display:
-            start_angle = self.rotation + self.gap_size / 2
-            end_angle = self.rotation + self.two_pi - self.gap_size / 2
+            if pixels is None:
+                pixels = get_pixel_rows(screen)
+                if pixels is None:
+                    self.draw_arcs(screen)
+                    return
+            if self.stroke_angles is None:
+                self.build_stroke(screen.get_size())
             
-            for offset in range(self.thickness):
-                radius = self.radius - offset
-                rect = pygame.Rect(
-                    self.center.x - radius,
-                    self.center.y - radius,
-                    radius * 2,
-                    radius * 2
-                )
-                pygame.draw.arc(screen, self.color, rect, start_angle, end_angle, 1)
+            color = map_color(screen, self.color)
+            for start, end in self.visible_runs():
+                pixels[self.stroke_index[start:end]] = color
+    
+    def draw_delta(self, layer: pygame.Surface, pixels: np.ndarray, clear_color: int) -> List[pygame.Rect]:
+        """Update a persistent layer from the last drawn rotation to the current one.
+
+        Only pixels that entered or left the gap are written. Returns the
+        rects that changed.
+        """
+        if self.stroke_angles is None:
+            self.build_stroke(layer.get_size())
+        
+        runs = self.visible_runs()
+        drawn = self.drawn_runs or []
+        if runs == drawn:
+            return []
+        
+        rects = []
+        color = map_color(layer, self.color)
+        for start, end in subtract_runs(drawn, runs):
+            pixels[self.stroke_index[start:end]] = clear_color
+            rects.append(self.run_bounds(start, end, layer.get_width()))
+        for start, end in subtract_runs(runs, drawn):
+            pixels[self.stroke_index[start:end]] = color
+            rects.append(self.run_bounds(start, end, layer.get_width()))
+        self.drawn_runs = runs
+        return rects
+    
+    def run_bounds(self, start: int, end: int, width: int) -> pygame.Rect:
+        """Bounding rect of a run of stroke pixels"""
+        index = self.stroke_index[start:end]
+        xs = index % width
+        ys = index // width
+        left, top = int(xs.min()), int(ys.min())
+        return pygame.Rect(left, top, int(xs.max()) - left + 1, int(ys.max()) - top + 1)
+    
+    def draw_arcs(self, screen: pygame.Surface):
+        """Stroke the ring with pygame.draw.arc, for surfaces pixels2d cannot map"""
+        start_angle = self.rotation + self.gap_size / 2
+        end_angle = self.rotation + self.two_pi - self.gap_size / 2
         
-        for particle in self.particles:
-            particle.draw(screen)
+        for offset in range(self.thickness):
+            radius = self.radius - offset
+            rect = pygame.Rect(
+                self.center.x - radius,
+                self.center.y - radius,
+                radius * 2,
+                radius * 2
+            )
+            pygame.draw.arc(screen, self.color, rect, start_angle, end_angle, 1)
     
     def check_collision(self, ball_pos: Vector2, ball_radius: float) -> Tuple[bool, Vector2]:
-        to_center = self.center - ball_pos
-        distance = to_center.length()
+        to_center_x = self.center.x - ball_pos.x
+        to_center_y = self.center.y - ball_pos.y
+        distance = math.sqrt(to_center_x * to_center_x + to_center_y * to_center_y)
         
-        outer_radius = self.radius + CONFIG['spacing'] / 2
-        inner_radius = self.radius - CONFIG['spacing'] / 2
+        outer_radius = self.radius + self.ring_set.spacing / 2
+        inner_radius = self.radius - self.ring_set.spacing / 2
         
+        # Only a hit allocates: the returned normal
         if inner_radius - ball_radius <= distance <= outer_radius + ball_radius:
-            angle = math.atan2(to_center.y, to_center.x)
+            angle = math.atan2(to_center_y, to_center_x)
             if not self.is_ball_in_gap(angle):
-                return True, to_center.normalize()
+                normal = Vector2(to_center_x, to_center_y)
+                normal.normalize_ip()
+                return True, normal
         return False, Vector2(0, 0)
\ No newline at end of file
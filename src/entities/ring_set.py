@@ -0,0 +1,250 @@
+import colorsys
+import math
+import numpy as np
+import pygame
+from typing import Dict, Iterator, Tuple
+from src.config import GameConfig
+from src.utils.vector import Vector2
+from src.entities.ring import Ring, get_polar_table, map_color
+
+def ceil_float32(values: np.ndarray) -> np.ndarray:
+    """The smallest float32 at or above each value"""
+    rounded = values.astype(np.float32)
+    return np.where(rounded < values, np.nextafter(rounded, np.float32(np.inf)), rounded)
+
+def get_ring_color(index: int, total: int) -> Tuple[int, int, int]:
+    hue = index / total
+    rgb = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
+    return (int(rgb[0] * 255), int(rgb[1] * 255), int(rgb[2] * 255))
+
+class RingSet:
+    """Every ring of the game as parallel arrays, innermost first.
+
+    Rotation is one vectorized update, destruction keeps a counter and the
+    innermost standing ring up to date, so none of the per-frame work loops
+    over rings in Python. Ring objects are views created on first access,
+    for the code that works on one ring at a time: the active ring's
+    collisions and the dirty-rect compositor's per-ring deltas.
+
+    draw() paints every ring in one pass over the pixels they cover,
+    giving each pixel the outermost ring that is visible there, exactly as
+    drawing the rings one by one from the inside out would. Most pixels
+    show the outermost ring covering them, so only the pixels in that
+    ring's gap, found by binary search in its angle-sorted band, or under
+    a destroyed ring, are searched for the ring that shows through.
+    draw_delta() keeps a persistent layer up to date by rewriting only
+    those pixels, this frame's and the last.
+    """
+
+    def __init__(self, center: Vector2, config: GameConfig):
+        self.center = center
+        self.count = count = config.rings
+        self.spacing = config.spacing
+        index = np.arange(count)
+        self.radius = 50 + index * self.spacing
+        self.rotation = index * config.offset
+        self.speed = config.rotation * (1 + index * config.offset)
+        self.gap = np.full(count, float(config.gap_size))
+        self.destroyed = np.zeros(count, dtype=bool)
+        self.force_display = np.zeros(count, dtype=bool)
+        self.destroyed_count = 0
+        self.active = 0  # Innermost ring still standing; count once all are destroyed
+
+        self.thickness = config.thickness
+        self.gap_tolerance = 0.1
+        self.destruction_particles = config.destruction_particles
+        self.colors = [get_ring_color(i, count) for i in range(count)]
+        self.views = [None] * count
+        self.drawn_hidden = None  # Shown rings and hidden pixels last written by draw_delta
+        self.two_pi = 2 * math.pi
+
+        # Per screen size: the covered pixels and the rings that cover each one
+        self.coverage: Dict[Tuple[int, int], Tuple[np.ndarray, ...]] = {}
+        self.bands: Dict[Tuple[int, int], Tuple[np.ndarray, ...]] = {}
+        self.overlaps: Dict[Tuple[int, int], bool] = {}
+        self.mapped_colors: Dict[Tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Ring:
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = Ring(self, index)
+        return view
+
+    def __iter__(self) -> Iterator[Ring]:
+        return (self[i] for i in range(self.count))
+
+    @property
+    def all_destroyed(self) -> bool:
+        return self.destroyed_count == self.count
+
+    def update(self, dt: float):
+        """Turn every standing ring by its speed"""
+        np.add(self.rotation, self.speed * dt, out=self.rotation, where=~self.destroyed)
+
+    def destroy(self, index: int) -> bool:
+        """Destroy a ring; False if it already was"""
+        if self.destroyed[index]:
+            return False
+        self.destroyed[index] = True
+        self.destroyed_count += 1
+        while self.active < self.count and self.destroyed[self.active]:
+            self.active += 1
+        return True
+
+    def get_coverage(self, size: Tuple[int, int]) -> Tuple[np.ndarray, ...]:
+        """(pixel index, angle, innermost ring, outermost ring) for each pixel any ring covers"""
+        coverage = self.coverage.get(size)
+        if coverage is None:
+            index, distance, angle = get_polar_table(self.center, size)
+            # The bounds Ring.build_stroke uses, for every ring at once
+            starts = np.searchsorted(distance, self.radius - self.thickness + 0.5)
+            ends = np.searchsorted(distance, self.radius + 0.5)
+            # Radii increase, so the rings covering a pixel are a contiguous range
+            positions = np.arange(starts[0], ends[-1])
+            outermost = np.searchsorted(starts, positions, side='right') - 1
+            innermost = np.searchsorted(ends, positions, side='right')
+            covered = innermost <= outermost
+            positions, innermost, outermost = positions[covered], innermost[covered], outermost[covered]
+            # Screen order, so painting writes memory front to back
+            order = np.argsort(index[positions], kind='stable')
+            coverage = (index[positions][order], angle[positions][order].astype(np.float64),
+                        innermost[order], outermost[order])
+            self.coverage[size] = coverage
+        return coverage
+
+    def get_bands(self, size: Tuple[int, int]) -> Tuple[np.ndarray, ...]:
+        """The covered pixels grouped by outermost ring, by angle within each group.
+
+        Returns (keys, band starts, pixel index, angle, innermost ring) in
+        that order. A key is ring << 32 | the bits of the pixel's float32
+        angle, which sort like the angles themselves since angles are never
+        negative; band i is keys[band_starts[i]:band_starts[i + 1]].
+        """
+        bands = self.bands.get(size)
+        if bands is None:
+            pixel_index, angle, innermost, outermost = self.get_coverage(size)
+            angle = angle.astype(np.float32)
+            keys = (outermost.astype(np.int64) << 32) | angle.view(np.int32)
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+            band_starts = np.searchsorted(keys, np.arange(self.count + 1, dtype=np.int64) << 32)
+            bands = self.bands[size] = (keys, band_starts, pixel_index[order], angle[order],
+                                        innermost[order].astype(np.int32))
+        return bands
+
+    def overlapping(self, size: Tuple[int, int]) -> bool:
+        """Whether any pixel is covered by more than one ring"""
+        overlaps = self.overlaps.get(size)
+        if overlaps is None:
+            _, _, innermost, outermost = self.get_coverage(size)
+            overlaps = self.overlaps[size] = bool((outermost > innermost).any())
+        return overlaps
+
+    def get_mapped_colors(self, surface: pygame.Surface) -> np.ndarray:
+        key = (surface.get_bitsize(), surface.get_masks())
+        colors = self.mapped_colors.get(key)
+        if colors is None:
+            colors = self.mapped_colors[key] = np.array([map_color(surface, color) for color in self.colors],
+                                                        dtype=np.int64)
+        return colors
+
+    def get_hidden(self, size: Tuple[int, int], shown: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """The covered pixels whose outermost ring does not show there.
+
+        Returns (pixel index, outermost ring, ring shown instead or -1) for
+        each: pixels in a shown ring's gap, one or two slices of its
+        angle-sorted band, and pixels under a destroyed ring with a shown
+        ring inside it, all of its band. Rings inside are tried from the
+        outside in, as drawing from the inside out would show them.
+        """
+        keys, band_starts, band_pixels, band_angles, band_innermost = self.get_bands(size)
+        rings = np.arange(self.count)
+        # previous_shown[i]: the outermost shown ring at or inside i, -1 if none
+        previous_shown = np.maximum.accumulate(np.where(shown, rings, -1)).astype(np.int32)
+        next_inside = np.concatenate(([-1], previous_shown[:-1])).astype(np.int32)
+        # Ring.visible_runs for every ring: the arc from start_angle to end_angle
+        start_angle = (self.rotation + self.gap / 2) % self.two_pi
+        end_angle = start_angle + self.two_pi - self.gap
+        wraps = end_angle >= self.two_pi
+        end_angle %= self.two_pi
+        # Pixel angles are float32, so comparing them with the next float32 up is exact
+        start_bound = ceil_float32(start_angle)
+        end_bound = ceil_float32(end_angle)
+
+        first, last = band_starts[:-1], band_starts[1:]
+        ring_keys = rings.astype(np.int64) << 32
+        gap_start = np.searchsorted(keys, ring_keys | end_bound.view(np.int32))
+        gap_end = np.searchsorted(keys, ring_keys | start_bound.view(np.int32))
+        split = shown & ~wraps
+        joined = shown & wraps
+        fall_through = ~shown & (previous_shown >= 0)
+        lows = np.concatenate((first[split], gap_start[split], gap_start[joined], first[fall_through]))
+        highs = np.concatenate((gap_end[split], last[split], gap_end[joined], last[fall_through]))
+        tops = np.concatenate((rings[split], rings[split], rings[joined], rings[fall_through]))
+        lengths = np.maximum(highs - lows, 0)
+        total = int(lengths.sum())
+        hidden = np.repeat(lows - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+
+        owner = np.full(total, -1, dtype=np.int32)
+        pending = np.arange(total)
+        candidate = np.repeat(next_inside.take(tops), lengths)
+        angle = band_angles.take(hidden)
+        innermost = band_innermost.take(hidden)
+        while pending.size:
+            after_start = angle >= start_bound.take(candidate)
+            before_end = angle < end_bound.take(candidate)
+            visible = np.where(wraps.take(candidate), after_start | before_end, after_start & before_end)
+            visible &= candidate >= innermost
+            found = np.flatnonzero(visible)
+            owner[pending.take(found)] = candidate.take(found)
+            # Pixels inside their innermost ring stay -1
+            left = np.flatnonzero(~visible & (candidate > innermost))
+            pending, candidate = pending.take(left), next_inside.take(candidate.take(left))
+            angle, innermost = angle.take(left), innermost.take(left)
+        return band_pixels.take(hidden), np.repeat(tops, lengths), owner
+
+    def draw(self, surface: pygame.Surface, pixels: np.ndarray = None):
+        """Paint every visible ring; pass get_pixel_rows(surface) to reuse a surface lock"""
+        shown = ~self.destroyed | self.force_display
+        if pixels is None or not self.overlapping(surface.get_size()):
+            # No pixel has two rings to choose from, so each ring's own runs are cheapest
+            for i in np.flatnonzero(shown):
+                self[i].draw(surface, pixels)
+            return
+
+        size = surface.get_size()
+        pixel_index, _, _, outermost = self.get_coverage(size)
+        hidden_pixels, _, owner = self.get_hidden(size, shown)
+        colors = self.get_mapped_colors(surface)
+        # Each covered pixel gets its outermost ring, then the hidden ones
+        # what shows instead; pixels no ring shows keep what they had
+        untouched = pixels[hidden_pixels]
+        drawn = np.flatnonzero(shown.take(outermost))
+        pixels[pixel_index.take(drawn)] = colors.take(outermost.take(drawn))
+        pixels[hidden_pixels] = np.where(owner >= 0, colors.take(owner), untouched)
+
+    def draw_delta(self, layer: pygame.Surface, pixels: np.ndarray, clear_color: int):
+        """Update a persistent layer of overlapping rings from the last drawn state.
+
+        Pixels no ring shows are set to clear_color. While the same rings
+        are shown, only the pixels hidden last time and this time are
+        written; set drawn_hidden to None after changing the layer otherwise.
+        """
+        size = layer.get_size()
+        shown = ~self.destroyed | self.force_display
+        hidden_pixels, hidden_tops, owner = self.get_hidden(size, shown)
+        colors = self.get_mapped_colors(layer)
+        outer_colors = np.where(shown, colors, clear_color)
+        drawn = self.drawn_hidden
+        if drawn is None or not np.array_equal(drawn[0], shown):
+            pixel_index, _, _, outermost = self.get_coverage(size)
+            pixels[pixel_index] = outer_colors.take(outermost)
+        else:
+            # Everything else still shows its outermost ring
+            drawn_pixels, drawn_tops = drawn[1], drawn[2]
+            pixels[drawn_pixels] = outer_colors.take(drawn_tops)
+        pixels[hidden_pixels] = np.append(colors, clear_color).take(owner)
+        self.drawn_hidden = (shown, hidden_pixels, hidden_tops)
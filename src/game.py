@@ -1,137 +1,165 @@
+import contextlib
 import pygame
-import colorsys
 import math
 import os
-# import cv2
-from src.config import CONFIG
+import time
+import numpy as np
+from src.config import GameConfig, config_fingerprint, snapshot_config
 from src.utils.vector import Vector2
 from src.entities.ball import Ball
-from src.entities.ring import Ring
-from src.managers.audio_manager import AudioManager
+from src.entities.ball_swarm import BallSwarm
+from src.entities.ring import get_pixel_rows
+from src.entities.ring_set import RingSet
+from src.entities.particle_system import ParticleSystem
+from src.managers.audio_manager import AudioManager, MIXER_SETTINGS
+from src.managers.audio_track import write_wav
+from src.recorder import GameRecorder
+from src.utils.sprite_cache import SpriteCache
+from src.utils.video_cache import VideoCache, draw_frame
+from src.utils.video_decoder import VideoDecoder
+from src.compositor import Compositor
+from src.profiler import FrameProfiler
+from src.startup import StartupReport
+from src.utils.rng import SeededRandom
+from src.utils.collision import time_to_reach_radius, MAX_IMPACTS_PER_STEP
+from src.replay import ReplayLog, BOUNCE_EVENT, RING_DESTROYED_EVENT
 from typing import List, Tuple
 
 class Game:
-    def __init__(self):
+    def __init__(self, recorder: GameRecorder = None, seed: int = None, replay: ReplayLog = None,
+                 profiler: FrameProfiler = None, config: GameConfig = None, startup: StartupReport = None):
+        # A frozen copy of the settings; later changes to CONFIG never reach this game
+        self.config = config if config is not None else snapshot_config()
+        self.startup = startup
+        # pygame.init() opens the mixer too; make that the only time, in the format AudioManager plays
+        pygame.mixer.pre_init(**MIXER_SETTINGS)
         pygame.init()
-        self.width = CONFIG['width']
-        self.height = CONFIG['height']
-        self.screen = pygame.display.set_mode((self.width, self.height), pygame.SRCALPHA)
-        pygame.display.set_caption("Circle Escape")
+        self.startup_lap('pygame.init')
+        self.width = self.config.width
+        self.height = self.config.height
+        if self.config.renderer == 'texture':
+            # TextureRenderer opens its own window; the screen only stages pixels for it
+            self.screen = pygame.Surface((self.width, self.height), 0, 32)
+        else:
+            self.screen = pygame.display.set_mode((self.width, self.height), pygame.SRCALPHA)
+            pygame.display.set_caption("Circle Escape")
+        self.startup_lap('display')
         
         self.center = Vector2(self.width/2, self.height/2)
-        self.ball = Ball(self.center, 8)
-        self.rings: List[Ring] = []
-        self.audio = AudioManager()
+        
+        # Everything random in the simulation derives from one seed
+        if replay is not None:
+            seed = replay.seed
+            if replay.fingerprint != config_fingerprint(self.config):
+                print("Warning: replay was recorded with different simulation settings")
+        self.rng = SeededRandom(seed)
+        self.seed = self.rng.seed
+        self.replay = replay
+        self.replay_log = ReplayLog(self.seed, 0.0, config_fingerprint(self.config))
+        self.sim_time = 0.0
+        self.step_dt = 0.0  # dt of the step in progress
+        self.frame = 0
+        
+        self.sprite_cache = SpriteCache(self.config.sprite_cache_size, self.config.sprite_radius_step,
+                                        self.config.sprite_alpha_levels)
+        self.ball = Ball(self.center, 8, sprite_cache=self.sprite_cache, rng=self.rng,
+                         config=self.config)
+        self.particles = ParticleSystem(rng=np.random.default_rng(self.seed),
+                                        sprite_cache=self.sprite_cache)
+        self.audio = AudioManager(self.config)  # Sounds load when the game starts
+        self.startup_lap('ball and particles')
         self.active_ring_index = 0  # Track the innermost active ring
         self.setup_rings()
+        self.startup_lap('rings')
+        
+        # Multi-ball mode: every ball lives in one array batch instead of self.ball
+        self.swarm = None
+        if self.config.balls > 1:
+            self.swarm = BallSwarm(self.config.balls, self.seed, self.rings,
+                                   sprite_cache=self.sprite_cache, config=self.config,
+                                   ball_radius=8)  # Drawn as circles, never icons
         
         self.clock = pygame.time.Clock()
+        self.recorder = recorder
+        if recorder is not None:
+            self.audio.start_track()
+            self.startup_lap('audio')
+        self.overlays = {}  # Rendered overlay text, keyed by message
+        self.profiler = profiler
+        self.compositor = None
+        self.texture_renderer = None
+        if self.config.renderer == 'texture':
+            from src.texture_renderer import TextureRenderer
+            self.texture_renderer = TextureRenderer(self)
+        elif self.config.dirty_rects:
+            self.compositor = Compositor(self)
+        self.startup_lap('renderer')
         self.game_won = False
         self.game_started = False
         self.two_pi = math.pi * 2
         
-        # Video background setup
-        self.bg_video = None
-        self.bg_surface = None
-        if os.path.exists('bg.mp4'):
+        # Video background, played from a pre-rendered frame cache or a decoder thread,
+        # set up on the first frame rather than here
+        self.background = None
+        self.bg_frame = None  # Screen pixels of the frame on show
+        self.background_pending = self.config.video_background and os.path.exists('bg.mp4')
+    
+    def load_video_background(self):
+        """Set up the pending video background and show its first frame"""
+        self.background_pending = False
+        with self.startup_stage('video background'):
             self.setup_video_background()
             # Capture first frame but don't start playing
             self.update_video_background(force_first_frame=True)
     
     def setup_video_background(self):
-        """Initialize video background if bg.mp4 exists"""
+        """Load bg.mp4's frame cache, building it on first use, or start decoding it"""
         try:
-            self.bg_video = cv2.VideoCapture('bg.mp4')
-            if not self.bg_video.isOpened():
-                print("Warning: Could not open bg.mp4")
-                return
-            
-            # Create a pygame surface for the video frame
-            self.bg_surface = pygame.Surface((self.width, self.height))
+            if self.config.bg_cache:
+                self.background = VideoCache('bg.mp4', self.screen, self.config.bg_opacity, self.config.cache_dir)
+            else:
+                self.background = VideoDecoder('bg.mp4', self.screen, self.config.bg_opacity,
+                                               self.config.bg_buffer_frames)
             print("Successfully loaded background video")
+        except ImportError:
+            print("Warning: OpenCV is needed to prepare bg.mp4, skipping the video background")
         except Exception as e:
             print(f"Warning: Error setting up video background: {str(e)}")
-            self.bg_video = None
+            self.background = None
     
-    def update_video_background(self, force_first_frame=False):
-        """Update the video frame"""
-        if self.bg_video is None or self.bg_surface is None:
+    def update_video_background(self, force_first_frame=False, steps: int = 1):
+        """Advance the video by steps frames, looping at the end"""
+        if self.background_pending:
+            self.load_video_background()
+        if self.background is None:
             return
         
         # Only update video if game has started or we're forcing first frame
         if not (self.game_started or force_first_frame):
             return
         
-        ret, frame = self.bg_video.read()
-        if not ret:
-            # Video ended, loop back to start
-            self.bg_video.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            ret, frame = self.bg_video.read()
-        
-        if ret:
-            # Calculate scaling to match height while maintaining aspect ratio
-            video_height = frame.shape[0]
-            video_width = frame.shape[1]
-            scale_factor = self.height / video_height
-            new_width = int(video_width * scale_factor)
-            
-            # Resize frame
-            frame = cv2.resize(frame, (new_width, self.height))
-            
-            # Center the frame horizontally
-            x_offset = max(0, (new_width - self.width) // 2)
-            frame = frame[:, x_offset:x_offset + self.width] if new_width > self.width else frame
-            
-            # Create a surface for the frame
-            video_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            
-            # Convert frame to pygame surface
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame_surface = pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1))
-            
-            # Create a surface for the alpha channel
-            alpha_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            alpha_surface.fill((255, 255, 255, int(255 * CONFIG['bg_opacity'])))
-            
-            # Blit the frame and apply alpha
-            video_surface.blit(frame_surface, (0, 0))
-            video_surface.blit(alpha_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            
-            self.bg_surface = video_surface
-    
-    def get_ring_color(self, index: int, total: int) -> Tuple[int, int, int]:
-        hue = index / total
-        rgb = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-        return (int(rgb[0] * 255), int(rgb[1] * 255), int(rgb[2] * 255))
+        self.bg_frame = self.background.next_frame(steps)
     
     def setup_rings(self):
-        total_space = CONFIG['max_ring_radius'] - 50
-        CONFIG['spacing'] = total_space / CONFIG['rings']
-        
-        base_radius = 50
-        for i in range(CONFIG['rings']):
-            radius = base_radius + i * CONFIG['spacing']
-            color = self.get_ring_color(i, CONFIG['rings'])
-            ring = Ring(self.center, radius, i * CONFIG['offset'], 
-                       CONFIG['gap_size'], color)
-            self.rings.append(ring)
-        self.rings.sort(key=lambda r: r.radius)
+        self.rings = RingSet(self.center, self.config)
     
     def start_game(self):
         """Initialize game state when space is pressed"""
         self.game_started = True
         # Give the ball an initial bounce
-        self.ball.vel = Vector2(0, -1).normalize() * CONFIG['ball_speed']
+        self.ball.vel = Vector2(0, -1).normalize() * self.config.ball_speed
+        if self.audio.enabled and not self.audio.loaded:
+            with self.startup_stage('audio'):
+                self.audio.load()
         self.audio.reset_song_sequence()
         # Reset video to start
-        if self.bg_video is not None:
-            self.bg_video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if self.background_pending:
+            self.load_video_background()
+        if self.background is not None:
+            self.background.restart()
     
     def get_innermost_active_ring(self) -> int:
-        for i, ring in enumerate(self.rings):
-            if not ring.destroyed:
-                return i
-        return len(self.rings)
+        return self.rings.active
     
     def check_ball_containment(self):
         if self.active_ring_index < len(self.rings):
@@ -140,10 +168,8 @@ class Game:
             distance = to_center.length()
             
             if distance > active_ring.radius + self.ball.radius:
-                normal = to_center.normalize()
-                self.ball.bounce(normal)
-                self.audio.play_song_snippet()
-                self.ball.grow()
+                to_center.normalize_ip()
+                self.bounce_ball(to_center)
                 return True
         return False
     
@@ -152,35 +178,54 @@ class Game:
             active_ring = self.rings[self.active_ring_index]
 
             to_center = active_ring.center - self.ball.pos
-            #to_center.y *= -1.0
-
-            from_center = self.ball.pos - active_ring.center
-            from_center.y *= -1.0
-
             distance = to_center.length()
-            angle = (math.atan2(from_center.y, from_center.x) + self.two_pi) % self.two_pi
+            # Angle of the ball around the ring with y pointing up
+            angle = (math.atan2(to_center.y, -to_center.x) + self.two_pi) % self.two_pi
             
             gap_detection_width = self.ball.radius + active_ring.thickness
 
             if abs(active_ring.radius - distance) < gap_detection_width:
-                #print(f"ball: {from_center},  radius: {distance}, angle: {angle * 360/self.two_pi}, active ring: {self.active_ring_index}, radius: {active_ring.radius}, gap: {(active_ring.rotation % self.two_pi) * 360/self.two_pi}")  
                 if active_ring.is_ball_in_gap(angle):
-                    active_ring.destroyed = True
-                    #print(f"ring {self.active_ring_index}/{len(self.rings)} with radius {active_ring.radius} is destroyed")
-                    self.active_ring_index += 1
-                    #if self.active_ring_index == len(self.rings):
-                    #    active_ring.force_display = True
-                    active_ring.create_destruction_particles()
-                    self.audio.play_bounce()
+                    self.destroy_active_ring()
                     return True
                 else:
-                    normal = to_center.normalize()
-                    self.ball.bounce(normal)
-                    self.audio.play_song_snippet()
-                    self.ball.grow()
+                    to_center.normalize_ip()
+                    self.bounce_ball(to_center)
                     return True
         return False
     
+    def bounce_ball(self, normal: Vector2):
+        """Bounce the ball off a ring, following the replay log when one is playing"""
+        self.ball.bounce(normal)
+        if self.replay is not None:
+            event = self.replay.next_event(BOUNCE_EVENT, self.frame)
+            if event is not None:
+                # Snap to the logged outcome so the run cannot drift from the recording
+                _, _, x, y, vel_x, vel_y, angular_velocity = event
+                self.ball.pos = Vector2(x, y)
+                self.ball.vel = Vector2(vel_x, vel_y)
+                self.ball.angular_velocity = angular_velocity
+        self.replay_log.record_bounce(self.frame, self.ball.pos, self.ball.vel, self.ball.angular_velocity)
+        self.audio.play_song_snippet(self.get_track_time(self.ball.sim_time))
+        self.ball.grow()
+    
+    def destroy_active_ring(self):
+        """The ball escaped through the active ring's gap"""
+        active_ring = self.rings[self.active_ring_index]
+        self.rings.destroy(self.active_ring_index)
+        self.log_ring_destroyed(self.active_ring_index)
+        #print(f"ring {self.active_ring_index}/{len(self.rings)} with radius {active_ring.radius} is destroyed")
+        self.active_ring_index += 1
+        #if self.active_ring_index == len(self.rings):
+        #    active_ring.force_display = True
+        active_ring.create_destruction_particles(self.particles)
+        self.audio.play_bounce(self.get_track_time(self.ball.sim_time))
+    
+    def log_ring_destroyed(self, ring_index: int):
+        if self.replay is not None:
+            self.replay.next_event(RING_DESTROYED_EVENT, self.frame)
+        self.replay_log.record_ring_destroyed(self.frame, ring_index)
+    
     def check_collisions(self):
         self.active_ring_index = self.get_innermost_active_ring()
         
@@ -188,48 +233,153 @@ class Game:
             return
         self.check_gap_collision()
     
+    def sweep_ball(self, dt: float):
+        """Move the ball through the step, resolving each ring impact at its exact time.
+
+        Between impacts the ball moves in a straight line, so the time it
+        reaches the active ring's gap-detection radius has a closed form.
+        The ring's rotation at that moment is known too, because rings turn
+        at a constant rate: it is the end-of-step rotation wound back by the
+        time left in the step. Impacts are resolved in order until the step
+        is used up, so no dt or speed can tunnel through a ring.
+        """
+        ball = self.ball
+        ball.apply_gravity(dt)
+        remaining = dt
+        
+        for _ in range(MAX_IMPACTS_PER_STEP):
+            if self.active_ring_index >= len(self.rings):
+                break
+            ring = self.rings[self.active_ring_index]
+            contact_radius = ring.radius - (ball.radius + ring.thickness)
+            t = time_to_reach_radius(ball.pos.x - ring.center.x, ball.pos.y - ring.center.y,
+                                     ball.vel.x, ball.vel.y, contact_radius, remaining)
+            if t is None:
+                break
+            
+            ball.pos.add_scaled_ip(ball.vel, t)
+            ball.sim_time += t
+            remaining -= t
+            
+            # Same angle convention as check_gap_collision: y flipped, in [0, 2*pi)
+            angle = math.atan2(ring.center.y - ball.pos.y, ball.pos.x - ring.center.x) % self.two_pi
+            rotation = ring.rotation - self.get_ring_speed(self.active_ring_index) * remaining
+            if ring.is_ball_in_gap(angle, rotation):
+                self.destroy_active_ring()
+            else:
+                normal = ring.center - ball.pos
+                normal.normalize_ip()
+                self.bounce_ball(normal)
+        
+        ball.pos.add_scaled_ip(ball.vel, remaining)
+        ball.sim_time += remaining
+        ball.update_spin(dt)
+    
+    def get_ring_speed(self, index: int) -> float:
+        return float(self.rings.speed[index])
+    
     def update_game_state(self, dt: float):
         if not self.game_started:
             return
             
         if not self.game_won:
-            self.ball.update(dt, None if self.active_ring_index >= len(self.rings) else self.rings[self.active_ring_index])
+            self.frame += 1
+            self.sim_time += dt
+            self.step_dt = dt
+            if self.swarm is None and not self.config.swept_collisions:
+                self.ball.update(dt)
             
-            base_speed = CONFIG['rotation']
-            for i, ring in enumerate(self.rings):
-                ring.update(dt, base_speed * (1 + i * CONFIG['offset']))
+            self.rings.update(dt)
+            self.particles.update(dt)
+            self.lap('update')
             
-            self.check_collisions()
+            if self.swarm is not None:
+                self.step_swarm(dt)
+            elif self.config.swept_collisions:
+                self.sweep_ball(dt)
+            else:
+                self.check_collisions()
+            self.lap('collisions')
             
-            if all(ring.destroyed for ring in self.rings):
+            if self.rings.all_destroyed:
                 self.game_won = True
     
+    def step_swarm(self, dt: float):
+        """Move and collide every ball of the swarm, then react to what it hit"""
+        destroyed, bounces = self.swarm.step(dt)
+        for index in destroyed:
+            self.rings.destroy(index)
+            self.log_ring_destroyed(index)
+            self.rings[index].create_destruction_particles(self.particles)
+            self.audio.play_bounce(self.get_track_time(self.sim_time))
+        if bounces:
+            # One snippet for the frame, not one per ball
+            self.audio.play_song_snippet(self.get_track_time(self.sim_time))
+        self.active_ring_index = self.get_innermost_active_ring()
+    
+    def draw_balls(self):
+        if self.swarm is not None:
+            self.swarm.draw(self.screen)
+        else:
+            self.ball.draw(self.screen)
+    
+    def get_ball_bounds(self) -> List[pygame.Rect]:
+        """Screen rects the ball, or every ball of the swarm, covers"""
+        if self.swarm is not None:
+            return [self.swarm.get_bounds()]
+        return self.ball.get_bounds()
+    
+    def get_overlay_text(self) -> str:
+        """Message shown over the playfield, or None during play"""
+        if not self.game_started:
+            return 'Press SPACE to Start'
+        if self.game_won:
+            return 'Escaped!'
+        return None
+    
+    def render_overlay(self) -> Tuple[pygame.Surface, pygame.Rect]:
+        """Rendered overlay text and its screen rect, cached per message"""
+        text = self.get_overlay_text()
+        if text not in self.overlays:
+            font = pygame.font.Font(None, 74)
+            surface = font.render(text, True, (255, 255, 255))
+            self.overlays[text] = (surface, surface.get_rect(center=(self.width/2, self.height/2)))
+        return self.overlays[text]
+    
     def draw(self):
-        # Start with a black background
-        self.screen.fill((0, 0, 0))
-        
-        # Draw video background if available
-        if self.bg_surface is not None:
-            self.screen.blit(self.bg_surface, (0, 0))
+        if self.texture_renderer is not None:
+            self.texture_renderer.draw()
+        elif self.compositor is not None:
+            self.compositor.draw()
+        else:
+            self.draw_full()
+    
+    def draw_full(self):
+        """Redraw every layer of the frame and flip the whole display"""
+        if self.bg_frame is not None:
+            # The frame is already faded over black
+            draw_frame(self.screen, self.bg_frame)
+        else:
+            self.screen.fill((0, 0, 0))
         
         # Draw game elements on top
-        for ring in self.rings:
-            ring.draw(self.screen)
+        # Rings write straight into the pixel array in one pass
+        pixels = get_pixel_rows(self.screen)
+        self.rings.draw(self.screen, pixels)
+        del pixels
+        self.particles.draw(self.screen)
         
-        self.ball.draw(self.screen)
+        self.draw_balls()
         
-        if not self.game_started:
-            font = pygame.font.Font(None, 74)
-            text = font.render('Press SPACE to Start', True, (255, 255, 255))
-            text_rect = text.get_rect(center=(self.width/2, self.height/2))
-            self.screen.blit(text, text_rect)
-        elif self.game_won:
-            font = pygame.font.Font(None, 74)
-            text = font.render('Escaped!', True, (255, 255, 255))
-            text_rect = text.get_rect(center=(self.width/2, self.height/2))
+        if self.get_overlay_text() is not None:
+            text, text_rect = self.render_overlay()
             self.screen.blit(text, text_rect)
+        if self.profiler is not None:
+            self.profiler.draw(self.screen)
+        self.lap('draw')
         
         pygame.display.flip()
+        self.lap('flip')
     
     def handle_events(self):
         for event in pygame.event.get():
@@ -238,6 +388,8 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and not self.game_started:
                     self.start_game()
+                elif event.key == pygame.K_F3 and self.profiler is not None:
+                    self.profiler.visible = not self.profiler.visible
         return True
     
     def run(self):
@@ -250,18 +402,24 @@ class Game:
         
         while running:
             frame_start = pygame.time.get_ticks()
+            if self.profiler is not None:
+                self.profiler.start_frame()
             
             current_time = pygame.time.get_ticks()
             dt = min((current_time - last_time) / 1000.0, 0.1)
             last_time = current_time
             
             running = self.handle_events()
+            self.lap('events')
             self.update_game_state(dt)
             
-            # Update video background
-            self.update_video_background()
+            # Update video background, skipping frames if this one ran long
+            self.update_video_background(steps=max(1, round(dt * target_fps)))
+            self.lap('video')
             
             self.draw()
+            self.capture_frame()
+            self.end_profiled_frame()
             
             # Calculate how long to wait
             frame_time = pygame.time.get_ticks() - frame_start
@@ -271,8 +429,139 @@ class Game:
             # Update display at exactly 60fps
             self.clock.tick(target_fps)
         
-        # Clean up video capture
-        if self.bg_video is not None:
-            self.bg_video.release()
+        self.close()
+        pygame.quit()
+    
+    def run_headless(self, fps: int = 60, max_frames: int = None, max_time: float = None) -> dict:
+        """Render offline with a fixed timestep of 1/fps, as fast as the CPU allows.
+
+        No sleeping and no event polling. Stops when the ball escapes or when
+        max_frames frames / max_time simulated seconds have been rendered.
+        """
+        dt = 1.0 / fps
+        frames = 0
+        self.replay_log.fps = fps
+        self.start_game()  # Also sets up the video background
+        if isinstance(self.background, VideoDecoder):
+            self.background.frame_locked = True  # Every rendered frame gets the next video frame
+        
+        start = time.perf_counter()
+        while not self.game_won:
+            if max_frames is not None and frames >= max_frames:
+                break
+            if max_time is not None and frames * dt >= max_time:
+                break
+            
+            if self.profiler is not None:
+                self.profiler.start_frame()
+            self.update_game_state(dt)
+            self.update_video_background()
+            self.lap('video')
+            self.draw()
+            self.capture_frame()
+            self.end_profiled_frame()
+            frames += 1
+        elapsed = time.perf_counter() - start
+        
+        stats = {
+            'frames': frames,
+            'sim_time': frames * dt,
+            'wall_time': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'won': self.game_won,
+            'sprite_cache': self.sprite_cache.stats(),
+        }
+        print(f"Rendered {frames} frames ({stats['sim_time']:.2f}s simulated) "
+              f"in {elapsed:.2f}s: {stats['fps']:.1f} fps, "
+              f"{'escaped' if self.game_won else 'stopped at limit'}")
+        if self.compositor is not None:
+            stats['compositor'] = self.compositor.stats()
+            print(f"Screen redrawn per frame: {stats['compositor']['mean_fraction']:.1%} average, "
+                  f"{stats['compositor']['max_fraction']:.1%} max")
+        if isinstance(self.background, VideoDecoder):
+            stats['video'] = self.background.stats()
+            print(f"Background decoder: {stats['video']['underruns']} underruns "
+                  f"({stats['video']['stall_time'] * 1000:.0f} ms waiting), "
+                  f"{stats['video']['loops']} loops")
+        if self.profiler is not None:
+            stats['profile'] = self.profiler.summary()
+            for name in self.profiler.phases:
+                phase = stats['profile'][name]
+                print(f"  {name:<10} p50 {phase['p50']:6.2f} ms  p95 {phase['p95']:6.2f} ms  "
+                      f"p99 {phase['p99']:6.2f} ms")
+        cache = stats['sprite_cache']
+        print(f"Sprite cache: {cache['size']} sprites, {cache['hits']} hits, "
+              f"{cache['misses']} misses ({cache['hit_rate']:.1%} hit rate), "
+              f"{cache['evictions']} evictions")
+        return stats
+    
+    def capture_frame(self):
+        """Hand the finished frame to the recorder, if one is attached"""
+        if self.recorder is not None:
+            self.recorder.capture_frame(self.screen)
+            self.lap('capture')
+    
+    def lap(self, name: str):
+        """End profiling phase name, if a profiler is attached"""
+        if self.profiler is not None:
+            self.profiler.lap(name)
+    
+    def startup_lap(self, name: str):
+        """End startup stage name, if a startup report is attached"""
+        if self.startup is not None:
+            self.startup.lap(name)
+    
+    def startup_stage(self, name: str):
+        """Time deferred setup in the startup report, if one is attached"""
+        return self.startup.stage(name) if self.startup is not None else contextlib.nullcontext()
+    
+    def end_profiled_frame(self):
+        """Record the frame's hot-path counts and close it in the profiler"""
+        profiler = self.profiler
+        if profiler is None:
+            return
+        profiler.count('particles', self.particles.count)
+        if self.swarm is not None:
+            profiler.count('balls', self.swarm.count)
+        else:
+            profiler.count('trail', len(self.ball.trail))
+        profiler.count('rings', len(self.rings) - self.rings.destroyed_count)
+        profiler.end_frame()
+    
+    def get_track_time(self, at: float) -> float:
+        """Where a sound at simulation time `at`, during the current step, falls in the recording.
+
+        Sounds are placed by captured frame rather than by simulation time,
+        which stands still on the title screen, skips the frames async
+        capture drops and advances by a variable dt in live play. The step
+        plays out over the frame interval that ends at the frame showing
+        its result, so a fixed 1 / fps step keeps sample-accurate timing.
+        """
+        if self.recorder is None or self.step_dt <= 0:
+            return at
+        into_step = 1.0 - (self.sim_time - at) / self.step_dt
+        return (self.recorder.frames_captured - 1 + into_step) / self.recorder.fps
+
+    def write_audio_track(self) -> str:
+        """Mix the run's sounds to a WAV next to the recording, as long as the video; None without audio"""
+        if self.audio.track is None:
+            return None
+        samples, sample_rate = self.audio.render_track(self.recorder.frames_captured / self.recorder.fps)
+        path = os.path.splitext(self.recorder.output_path)[0] + '.audio.wav'
+        write_wav(path, samples, sample_rate)
+        return path
+    
+    def close(self):
+        """Release external resources held by the game"""
+        if self.recorder is not None:
+            audio_path = self.write_audio_track()
+            self.recorder.stop_recording(audio_path)
+            if audio_path is not None:
+                os.remove(audio_path)
+            self.recorder = None
         
-        pygame.quit()
\ No newline at end of file
+        # Unmap the video frames
+        if self.background is not None:
+            self.background.close()
+            self.background = None
+            self.bg_frame = None
\ No newline at end of file
@@ -0,0 +1,18 @@
+import os
+
+
+def enable_headless():
+    """Point SDL at its dummy drivers so no window or sound device is needed.
+
+    Must be called before pygame.init().
+    """
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    disable_audio_device()
+
+
+def disable_audio_device():
+    """Point SDL's audio at its dummy driver, so pygame.init() opens no sound device.
+
+    Must be called before pygame.init().
+    """
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
@@ -1,30 +1,64 @@
 import time
 import os
 from typing import List
+from src.config import GameConfig, snapshot_config
+from src.managers.audio_track import AudioTrack
+
+# Mixer format for playback and the recorded track. Game pre-inits the mixer with
+# it, so pygame.init() opens the device once and in this format.
+MIXER_SETTINGS = {'frequency': 44100, 'size': -16, 'channels': 2, 'buffer': 1024}
 
 class AudioManager:
-    def __init__(self):
+    def __init__(self, config: GameConfig = None):
+        config = config if config is not None else snapshot_config()
+        self.enabled = config.audio
+        self.snippet_cache_size = config.snippet_cache_size
+        self.cache_dir = config.cache_dir
+        self.loaded = False
         self.bounce = None
         self.song = None
         self.song_snippets: List = []
         self.song_channel = None
         self.bounce_channel = None
         self.current_snippet_index = 0
+        self.track = None  # Offline AudioTrack, while recording
+        self.snippet_duration = 0.5  # Duration of each snippet in seconds
+        
+        self.last_collision_time = 0
+        self.collision_cooldown = 0.1
+        self.current_snippet_start_time = 0
+    
+    def load(self):
+        """Open the mixer and load the sounds, once; does nothing with audio off.
+
+        Deferred until the game starts or recording needs it, so runs
+        that never play a sound never pay for the mixer or the song decode.
+        """
+        if self.loaded or not self.enabled:
+            return
+        self.loaded = True
         
-        # Initialize audio with a higher quality
         try:
             import pygame
-            pygame.mixer.init(
-                frequency=44100,
-                size=-16,
-                channels=2,
-                buffer=1024,
-                allowedchanges=0
-            )
+            # Usually already open from pygame.init(), in which case this does nothing
+            pygame.mixer.init(**MIXER_SETTINGS, allowedchanges=0)
             print("=== Audio Initialization ===")
             print("Attempting to load audio files...")
             self.bounce = pygame.mixer.Sound('bounce.mp3')
-            self.song = pygame.mixer.Sound('song.mp3')
+            
+            # Split the song into half-second snippets, decoded once and built as they are played
+            try:
+                from src.managers.snippet_bank import SnippetBank
+                self.song_snippets = SnippetBank('song.mp3', self.snippet_duration,
+                                                 self.snippet_cache_size, self.cache_dir)
+                print(f"Song split into {len(self.song_snippets)} snippets")
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                print(f"Warning: Could not split song into snippets: {str(e)}")
+                self.song = pygame.mixer.Sound('song.mp3')
+                self.song_snippets = [self.song]
+                print("Falling back to using entire song as single snippet")
             print("Successfully loaded audio files")
             
             # Set up channels with higher quality
@@ -34,67 +68,38 @@ class AudioManager:
             if self.song_channel and self.bounce_channel:
                 self.song_channel.set_volume(0.7)
                 self.bounce_channel.set_volume(0.7)
-            
-            # Split the song into half-second snippets
-            try:
-                print("\n=== Snippet Creation ===")
-                print("Step 1: Importing sndarray...")
-                import pygame.sndarray
-                
-                print("Step 2: Converting sound to array...")
-                song_array = pygame.sndarray.samples(self.song)
-                print(f"Song array shape: {song_array.shape}")
-                
-                print("\nStep 3: Calculating dimensions...")
-                sample_rate = pygame.mixer.get_init()[0]
-                num_channels = 2
-                samples_per_half_second = sample_rate // 2  # Changed to half second
-                total_samples = song_array.shape[0]
-                total_half_seconds = (total_samples // samples_per_half_second) * 2  # Multiply by 2 for half seconds
-                
-                print(f"Sample rate: {sample_rate}")
-                print(f"Total samples: {total_samples}")
-                print(f"Samples per half second: {samples_per_half_second}")
-                print(f"Total half seconds: {total_half_seconds}")
-                
-                print("\nStep 4: Creating snippets...")
-                for i in range(total_half_seconds):
-                    start = i * samples_per_half_second
-                    end = start + samples_per_half_second
-                    if end > total_samples:
-                        break
-                    
-                    snippet_array = song_array[start:end]
-                    try:
-                        snippet = pygame.sndarray.make_sound(snippet_array)
-                        self.song_snippets.append(snippet)
-                        print(f"Created snippet {i+1}")
-                    except Exception as e:
-                        print(f"Failed to create snippet {i+1}: {str(e)}")
-                        raise e
-                
-                print(f"\nFinished! Created {len(self.song_snippets)} snippets")
-                
-            except Exception as e:
-                print(f"\n!!! Snippet creation failed !!!")
-                print(f"Error: {str(e)}")
-                print(f"Error type: {type(e)}")
-                import traceback
-                print("Traceback:")
-                traceback.print_exc()
-                self.song_snippets = [self.song]
-                print("Falling back to using entire song as single snippet")
         
         except Exception as e:
             print(f"Warning: Could not initialize audio: {str(e)}")
             print("Current working directory:", os.path.abspath(os.curdir))
+    
+    def start_track(self):
+        """Also log every sound to an AudioTrack, to be mixed into the recording"""
+        self.load()
+        if self.bounce is not None and self.song_snippets:
+            self.track = AudioTrack(len(self.song_snippets), self.collision_cooldown)
+    
+    def render_track(self, duration: float, offset: float = 0.0):
+        """Mix the logged sounds into PCM at the mixer's format; returns (samples, sample rate)"""
+        import pygame
+        import pygame.sndarray
+        snippets = self.song_snippets
         
-        self.last_collision_time = 0
-        self.collision_cooldown = 0.1
-        self.snippet_duration = 0.5  # Duration of each snippet in seconds
-        self.current_snippet_start_time = 0
+        def get_snippet(index: int):
+            if hasattr(snippets, 'get_samples'):
+                return snippets.get_samples(index)
+            return pygame.sndarray.array(snippets[index])
+        
+        sample_rate = pygame.mixer.get_init()[0]
+        samples = self.track.mix(duration, sample_rate, pygame.sndarray.array(self.bounce), get_snippet,
+                                 offset, volume=0.7)
+        return samples, sample_rate
     
-    def play_song_snippet(self):
+    def play_song_snippet(self, at: float = None):
+        """at: time of the bounce in the recording, for the offline track"""
+        if self.track is not None and at is not None:
+            self.track.record_song_snippet(at)
+        
         if self.song_snippets and self.song_channel:
             current_time = time.time()
             
@@ -113,9 +118,13 @@ class AudioManager:
                 # Increment and wrap around to start if we reach the end
                 self.current_snippet_index = (self.current_snippet_index + 1) % len(self.song_snippets)
     
-    def play_bounce(self):
+    def play_bounce(self, at: float = None):
+        if self.track is not None and at is not None:
+            self.track.record_bounce(at)
         if self.bounce and self.bounce_channel:
             self.bounce_channel.play(self.bounce)
     
     def reset_song_sequence(self):
-        self.current_snippet_index = 0
\ No newline at end of file
+        self.current_snippet_index = 0
+        if self.track is not None:
+            self.track.reset_song_sequence()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import math
+import wave
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+class AudioTrack:
+    """Offline log of the game's sounds, mixed to PCM after the run.
+
+    Sounds are stamped with their time in the recording instead of going
+    only to the live mixer, so a render running faster than real time
+    still gets a sample-accurate soundtrack. The song snippet cooldown and cycling follow
+    AudioManager.play_song_snippet, and mixing follows the live mixer:
+    bounces share one channel, so a new bounce cuts off the last, while each
+    snippet plays in full on a free channel and may overlap the next.
+    """
+
+    def __init__(self, snippet_count: int, collision_cooldown: float = 0.1):
+        self.snippet_count = snippet_count
+        self.collision_cooldown = collision_cooldown
+        self.bounces: List[float] = []
+        self.snippets: List[Tuple[float, int]] = []
+        self.current_snippet_index = 0
+        self.last_collision_time = -math.inf
+
+    def record_bounce(self, at: float):
+        self.bounces.append(at)
+
+    def record_song_snippet(self, at: float):
+        if at - self.last_collision_time > self.collision_cooldown:
+            self.snippets.append((at, self.current_snippet_index))
+            self.last_collision_time = at
+            self.current_snippet_index = (self.current_snippet_index + 1) % self.snippet_count
+
+    def reset_song_sequence(self):
+        self.current_snippet_index = 0
+
+    def mix(self, duration: float, sample_rate: int, bounce: np.ndarray,
+            get_snippet: Callable[[int], np.ndarray], offset: float = 0.0,
+            volume: float = 0.7) -> np.ndarray:
+        """Mix the logged sounds into duration seconds of PCM in bounce's format.
+
+        An event at time t starts at sample (t - offset) * sample_rate.
+        """
+        channels = bounce.shape[1] if bounce.ndim > 1 else 1
+        output = np.zeros((int(round(duration * sample_rate)), channels), dtype=np.float32)
+        self.mix_sounds(output, [(at, bounce) for at in self.bounces], sample_rate, offset, volume,
+                        cut_off=True)
+        self.mix_sounds(output, [(at, get_snippet(index)) for at, index in self.snippets],
+                        sample_rate, offset, volume, cut_off=False)
+
+        limits = np.iinfo(bounce.dtype)
+        return np.clip(output, limits.min, limits.max).astype(bounce.dtype)
+
+    def mix_sounds(self, output: np.ndarray, events: List[Tuple[float, np.ndarray]],
+                   sample_rate: int, offset: float, volume: float, cut_off: bool):
+        """Add sounds at their start times; with cut_off each stops where the next one starts"""
+        starts = [int(round((at - offset) * sample_rate)) for at, _ in events] + [len(output)]
+        for k, (_, samples) in enumerate(events):
+            start = max(0, starts[k])
+            end = min(start + len(samples), len(output))
+            if cut_off:
+                end = min(end, starts[k + 1])
+            if end > start:
+                output[start:end] += samples[:end - start].reshape(end - start, -1) * volume
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(samples.dtype.itemsize)
+        f.setframerate(sample_rate)
+        f.writeframes(np.ascontiguousarray(samples).tobytes())
@@ -0,0 +1,78 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+import pygame.sndarray
+
+class SnippetBank:
+    """Fixed-length song snippets, built on demand from a memory-mapped decode.
+
+    The song is decoded once per (file contents, mixer settings) and the PCM
+    stored as a .npy file in cache_dir; later runs memory-map it instead of
+    decoding. A snippet is a slice of that map, turned into a Sound only
+    when it is played, and only the last max_live Sounds are kept.
+    Indexing and len() work like the list of Sounds this replaces.
+    """
+
+    def __init__(self, path: str, snippet_seconds: float = 0.5, max_live: int = 16,
+                 cache_dir: str = '.cache'):
+        self.path = path
+        self.max_live = max_live
+        self.live: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        frequency, size, channels = pygame.mixer.get_init()
+        self.samples = self.load_samples(cache_dir, frequency, size, channels)
+        self.samples_per_snippet = int(frequency * snippet_seconds)
+        self.count = len(self.samples) // self.samples_per_snippet
+
+    def get_cache_path(self, cache_dir: str, frequency: int, size: int, channels: int) -> str:
+        digest = hashlib.sha1()
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"{frequency}:{size}:{channels}".encode())
+        return os.path.join(cache_dir, f"song-{digest.hexdigest()[:16]}.npy")
+
+    def load_samples(self, cache_dir: str, frequency: int, size: int, channels: int) -> np.ndarray:
+        cache_path = self.get_cache_path(cache_dir, frequency, size, channels)
+        if not os.path.exists(cache_path):
+            # Decode at the mixer's settings, the only format make_sound accepts
+            samples = pygame.sndarray.array(pygame.mixer.Sound(self.path))
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_path = cache_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.save(f, samples)
+            os.replace(temp_path, cache_path)  # Never leave a half-written cache behind
+            print(f"Decoded {self.path} to {cache_path}")
+        return np.load(cache_path, mmap_mode='r')
+
+    def get_samples(self, index: int) -> np.ndarray:
+        """A snippet's PCM, as a view into the memory-mapped decode"""
+        start = index * self.samples_per_snippet
+        return self.samples[start:start + self.samples_per_snippet]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> pygame.mixer.Sound:
+        if not 0 <= index < self.count:
+            raise IndexError(f"snippet {index} out of range")
+        sound = self.live.get(index)
+        if sound is not None:
+            self.live.move_to_end(index)
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        sound = pygame.sndarray.make_sound(np.ascontiguousarray(self.get_samples(index)))
+        self.live[index] = sound
+        if len(self.live) > self.max_live:
+            self.live.popitem(last=False)
+        return sound
+
+    def stats(self) -> dict:
+        return {'snippets': self.count, 'live': len(self.live), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,154 @@
+import csv
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+class FrameProfiler:
+    """Per-phase frame timings and hot-path counters in fixed-size ring buffers.
+
+    The game calls start_frame(), then lap(name) at the end of each phase, which charges the
+    time since the previous lap to that phase, and count(name, value) for
+    per-frame counters; end_frame() closes the frame. Each of these is a
+    clock read and an array store, so profiling can stay on for whole runs.
+    Only the last `capacity` frames are kept.
+    """
+
+    def __init__(self, capacity: int = 600):
+        self.capacity = capacity
+        self.frames = 0  # Frames finished so far
+        self.phases: Dict[str, np.ndarray] = {}
+        self.counters: Dict[str, np.ndarray] = {}
+        self.frame_start = time.perf_counter()
+        self.last_lap = self.frame_start
+        self.visible = False
+        self.overlay: Optional[Tuple[pygame.Surface, pygame.Rect]] = None
+        self.font = None
+
+    def get_buffer(self, table: Dict[str, np.ndarray], name: str) -> np.ndarray:
+        buffer = table.get(name)
+        if buffer is None:
+            # Phases first seen mid-run read as zero for the frames before
+            buffer = table[name] = np.zeros(self.capacity)
+        return buffer
+
+    def lap(self, name: str):
+        """Charge the time since the last lap to phase name"""
+        now = time.perf_counter()
+        slot = self.frames % self.capacity
+        buffer = self.phases.get(name)
+        if buffer is None:
+            buffer = self.get_buffer(self.phases, name)
+        buffer[slot] += now - self.last_lap
+        self.last_lap = now
+
+    def count(self, name: str, value: float):
+        buffer = self.counters.get(name)
+        if buffer is None:
+            buffer = self.get_buffer(self.counters, name)
+        buffer[self.frames % self.capacity] = value
+
+    def start_frame(self):
+        """Start timing a frame; time since the last end_frame (vsync waits) is not counted"""
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def end_frame(self):
+        now = time.perf_counter()
+        slot = self.frames % self.capacity
+        self.get_buffer(self.phases, 'frame')[slot] = now - self.frame_start
+        self.frames += 1
+
+        # Clear the next slot, which laps accumulate into
+        slot = self.frames % self.capacity
+        for buffer in self.phases.values():
+            buffer[slot] = 0.0
+        for buffer in self.counters.values():
+            buffer[slot] = 0.0
+
+    def window(self, buffer: np.ndarray) -> np.ndarray:
+        """The finished frames in a buffer, oldest first"""
+        if self.frames < self.capacity:
+            return buffer[:self.frames]
+        slot = self.frames % self.capacity
+        return np.concatenate((buffer[slot:], buffer[:slot]))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99/max per phase in milliseconds, and mean/max per counter"""
+        result = {}
+        for name, buffer in self.phases.items():
+            samples = self.window(buffer) * 1000
+            if len(samples):
+                p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+                result[name] = {'p50': p50, 'p95': p95, 'p99': p99, 'max': samples.max()}
+        for name, buffer in self.counters.items():
+            samples = self.window(buffer)
+            if len(samples):
+                result[name] = {'mean': samples.mean(), 'max': samples.max()}
+        return {name: {key: float(value) for key, value in values.items()}
+                for name, values in result.items()}
+
+    def get_overlay(self) -> Tuple[pygame.Surface, pygame.Rect]:
+        """The overlay table, re-rendered twice a second at 60 fps"""
+        if self.overlay is None or self.frames % 30 == 0:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 24)
+            lines = ['phase       p50    p95    p99 ms']
+            summary = self.summary()
+            for name in self.phases:
+                if name in summary:
+                    values = summary[name]
+                    lines.append(f"{name:<10}{values['p50']:>6.2f} {values['p95']:>6.2f} {values['p99']:>6.2f}")
+            for name in self.counters:
+                if name in summary:
+                    lines.append(f"{name:<10}{summary[name]['mean']:>8.1f} avg {summary[name]['max']:>6.0f} max")
+
+            rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+            width = max(surface.get_width() for surface in rendered) + 16
+            height = sum(surface.get_height() for surface in rendered) + 16
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            surface.fill((0, 0, 0, 180))
+            y = 8
+            for line in rendered:
+                surface.blit(line, (8, y))
+                y += line.get_height()
+            # Keep the previous rect covered too, so a shrinking table gets erased
+            rect = surface.get_rect(topleft=(8, 8))
+            if self.overlay is not None:
+                rect = rect.union(self.overlay[1])
+            self.overlay = (surface, rect)
+        return self.overlay
+
+    def draw(self, screen: pygame.Surface):
+        if self.visible:
+            surface, rect = self.get_overlay()
+            screen.blit(surface, rect.topleft)
+
+    def get_bounds(self) -> List[pygame.Rect]:
+        return [self.get_overlay()[1]] if self.visible else []
+
+    def dump(self, path: str):
+        """Write the buffered frames: per-frame rows for .csv, summary and samples for .json"""
+        names = list(self.phases) + list(self.counters)
+        columns = [self.window(buffer) for buffer in self.phases.values()]
+        columns += [self.window(buffer) for buffer in self.counters.values()]
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame'] + [f"{name}_ms" if name in self.phases else name for name in names])
+                first = self.frames - len(columns[0]) if columns else 0
+                for row, values in enumerate(zip(*columns)):
+                    writer.writerow([first + row] + [round(value * 1000, 4) if name in self.phases else value
+                                                     for name, value in zip(names, values)])
+        else:
+            with open(path, 'w') as f:
+                json.dump({
+                    'frames': self.frames,
+                    'summary': self.summary(),
+                    'phases_ms': {name: (self.window(buffer) * 1000).tolist()
+                                  for name, buffer in self.phases.items()},
+                    'counters': {name: self.window(buffer).tolist()
+                                 for name, buffer in self.counters.items()},
+                }, f, indent=2)
+        print(f"Frame profile written to {path}")
@@ -1,69 +1,314 @@
 import pygame
 import os
+import queue
+import sys
+import tempfile
+import threading
+import time
 from datetime import datetime
 import subprocess
 
+# ffmpeg pixel formats we can feed a 32-bit surface buffer to without conversion
+RAW_PIXEL_FORMATS = {'rgb0', 'bgr0', '0rgb', '0bgr'}
+
 class GameRecorder:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, fps: int = 60,
+                 backend: str = 'pipe', output_path: str = None,
+                 async_capture: bool = False, queue_size: int = 8,
+                 backpressure: str = 'block'):
         self.width = width
         self.height = height
+        self.fps = fps
+        self.backend = backend
         self.recording = False
         self.frame_count = 0
         self.output_dir = "recordings"
-        
+        self.temp_dir = None
+        self.ffmpeg = None
+        self.ffmpeg_log = None
+        self.pixel_format = None
+        self.error = None  # Why the recording failed, if it did
+
+        # Async capture: the game thread copies into a pooled surface, a writer thread encodes it
+        if backpressure not in ('block', 'drop'):
+            raise ValueError(f"Unknown backpressure mode: {backpressure}")
+        self.async_capture = async_capture
+        self.queue_size = queue_size
+        self.backpressure = backpressure
+        self.free_buffers = None
+        self.ready_frames = None
+        self.writer = None
+        self.frames_dropped = 0
+        self.stalls = 0
+        self.stall_time = 0.0
+        self.max_queue_depth = 0
+        self.queue_depth_total = 0
+        self.frames_queued = 0
+
         # Create recordings directory if it doesn't exist
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
-            
+
         # Generate unique filename based on timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.temp_dir = os.path.join(self.output_dir, f"temp_{timestamp}")
-        os.makedirs(self.temp_dir)
-        
-        self.final_filename = f"gameplay_{timestamp}.mp4"
+        self.output_path = output_path or os.path.join(self.output_dir, f"gameplay_{timestamp}.mp4")
+
+        if self.backend == 'png':
+            self.temp_dir = os.path.join(self.output_dir, f"temp_{timestamp}")
+            os.makedirs(self.temp_dir)
+        elif self.backend != 'pipe':
+            raise ValueError(f"Unknown recorder backend: {backend}")
+
         self.recording = True
-        print(f"Started recording...")
-    
+        print(f"Started recording ({self.backend})...")
+
+    def get_pixel_format(self, screen: pygame.Surface) -> str:
+        """Name the ffmpeg pixel format matching the surface's memory layout"""
+        if screen.get_bitsize() != 32 or screen.get_pitch() != self.width * 4:
+            return 'rgb24'
+
+        channels = []
+        for shift in range(0, 32, 8):
+            byte_mask = 0xff << shift
+            name = '0'
+            for mask, channel in zip(screen.get_masks()[:3], 'rgb'):
+                if mask == byte_mask:
+                    name = channel
+            channels.append(name)
+        if sys.byteorder == 'big':
+            channels.reverse()
+
+        pixel_format = ''.join(channels)
+        return pixel_format if pixel_format in RAW_PIXEL_FORMATS else 'rgb24'
+
+    def start_pipe(self, screen: pygame.Surface):
+        """Launch a persistent ffmpeg process that reads raw frames from stdin"""
+        self.pixel_format = self.get_pixel_format(screen)
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-y',  # Overwrite output file if it exists
+            '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', self.pixel_format,
+            '-s', f'{self.width}x{self.height}',
+            '-framerate', str(self.fps),
+            '-i', '-',
+            '-c:v', 'libx264',
+            '-preset', 'ultrafast',
+            '-crf', '18',
+            '-pix_fmt', 'yuv420p',
+            self.output_path
+        ]
+
+        # ffmpeg's stderr goes to a file so a chatty encoder can never fill a pipe and stall us
+        self.ffmpeg_log = tempfile.TemporaryFile()
+        try:
+            self.ffmpeg = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE,
+                                           stdout=subprocess.DEVNULL, stderr=self.ffmpeg_log)
+        except OSError as e:
+            print(f"Warning: Could not start ffmpeg ({str(e)}), falling back to PNG frames")
+            self.ffmpeg_log.close()
+            self.ffmpeg_log = None
+            self.backend = 'png'
+            self.temp_dir = os.path.splitext(self.output_path)[0] + "_frames"
+            os.makedirs(self.temp_dir, exist_ok=True)
+
+    @property
+    def frames_captured(self) -> int:
+        """Frames handed to the video so far: written, or queued for the writer; dropped ones don't count"""
+        return self.frames_queued if self.async_capture else self.frame_count
+
     def capture_frame(self, screen: pygame.Surface):
         """Capture the current frame if recording is active"""
-        if self.recording:
+        if not self.recording:
+            return
+
+        if self.async_capture:
+            self.enqueue_frame(screen)
+        else:
+            self.write_frame(screen)
+
+    def start_writer(self, screen: pygame.Surface):
+        """Preallocate the buffer pool and start the writer thread"""
+        self.free_buffers = queue.Queue()
+        self.ready_frames = queue.Queue()
+        for _ in range(self.queue_size):
+            self.free_buffers.put(pygame.Surface(screen.get_size(), 0, screen))
+        self.writer = threading.Thread(target=self.writer_loop, name="recorder-writer", daemon=True)
+        self.writer.start()
+
+    def enqueue_frame(self, screen: pygame.Surface):
+        """Copy the frame into a pooled buffer and queue it for the writer thread"""
+        if self.writer is None:
+            self.start_writer(screen)
+
+        try:
+            buffer = self.free_buffers.get_nowait()
+        except queue.Empty:
+            if self.backpressure == 'drop':
+                self.frames_dropped += 1
+                return
+            # Block the game thread until the writer hands a buffer back
+            self.stalls += 1
+            stall_start = time.perf_counter()
+            buffer = self.free_buffers.get()
+            self.stall_time += time.perf_counter() - stall_start
+
+        buffer.blit(screen, (0, 0))
+        self.ready_frames.put(buffer)
+
+        depth = self.ready_frames.qsize()
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self.queue_depth_total += depth
+        self.frames_queued += 1
+
+    def writer_loop(self):
+        """Encode queued frames until the stop sentinel arrives"""
+        while True:
+            buffer = self.ready_frames.get()
+            if buffer is None:
+                break
+            if self.recording:
+                try:
+                    self.write_frame(buffer)
+                except Exception as e:
+                    # Keep draining so a blocked game thread can never hang on us
+                    print(f"Warning: Error while writing frame: {str(e)}")
+                    self.error = f"Error while writing frame: {str(e)}"
+                    self.recording = False
+            self.free_buffers.put(buffer)
+
+    def stop_writer(self):
+        """Drain the frame queue and report how the writer kept up"""
+        self.ready_frames.put(None)
+        self.writer.join()
+        self.writer = None
+
+        average_depth = self.queue_depth_total / self.frames_queued if self.frames_queued else 0.0
+        print(f"Frame queue: max depth {self.max_queue_depth}/{self.queue_size}, "
+              f"average depth {average_depth:.1f}")
+        print(f"Backpressure ({self.backpressure}): {self.stalls} stalls "
+              f"({self.stall_time * 1000:.0f} ms blocked), {self.frames_dropped} frames dropped")
+
+    def write_frame(self, screen: pygame.Surface):
+        """Encode one frame with the active backend"""
+        if self.backend == 'pipe' and self.ffmpeg is None:
+            self.start_pipe(screen)
+
+        if self.backend == 'pipe':
+            if self.pixel_format == 'rgb24':
+                frame = pygame.image.tobytes(screen, 'RGB')
+            else:
+                # Hand ffmpeg the surface memory directly, no conversion or copy
+                frame = screen.get_buffer()
+            try:
+                self.ffmpeg.stdin.write(frame)
+            except BrokenPipeError:
+                print("Warning: ffmpeg exited early, stopping recording")
+                self.error = "ffmpeg exited early"
+                self.recording = False
+                return
+            finally:
+                del frame
+        else:
             # Save frame as PNG
             frame_filename = os.path.join(self.temp_dir, f"frame_{self.frame_count:06d}.png")
             pygame.image.save(screen, frame_filename)
-            self.frame_count += 1
-    
-    def stop_recording(self):
-        """Stop recording and combine frames into video"""
-        if self.recording:
+        self.frame_count += 1
+
+    def finish_pipe(self):
+        """Close ffmpeg's input and wait for it to finish encoding"""
+        if self.ffmpeg is None:
+            return
+        try:
+            self.ffmpeg.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = self.ffmpeg.wait()
+        if returncode != 0:
+            self.ffmpeg_log.seek(0)
+            error = self.ffmpeg_log.read().decode(errors='replace').strip()
+            raise RuntimeError(f"ffmpeg exited with code {returncode}: {error}")
+
+    def mux_audio(self, audio_path: str):
+        """Add an audio track to the finished video, copying the video stream as is"""
+        root, extension = os.path.splitext(self.output_path)
+        muxed_path = root + '.muxed' + extension
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-y',
+            '-loglevel', 'error',
+            '-i', self.output_path,
+            '-i', audio_path,
+            '-map', '0:v',
+            '-map', '1:a',
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            '-b:a', '192k',
+            muxed_path
+        ]
+        subprocess.run(ffmpeg_cmd, check=True, capture_output=True)
+        os.replace(muxed_path, self.output_path)
+
+    def encode_png_frames(self, audio_path: str = None):
+        """Combine the PNG frame sequence, and the audio track if any, into a video"""
+        # Construct ffmpeg command for video creation
+        ffmpeg_cmd = [
+            'ffmpeg',
+            '-y',  # Overwrite output file if it exists
+            '-framerate', str(self.fps),
+            '-i', os.path.join(self.temp_dir, 'frame_%06d.png'),
+        ]
+        if audio_path is not None:
+            ffmpeg_cmd += ['-i', audio_path, '-c:a', 'aac', '-b:a', '192k']
+        ffmpeg_cmd += [
+            '-c:v', 'libx264',
+            '-preset', 'ultrafast',
+            '-crf', '18',
+            '-pix_fmt', 'yuv420p',
+            self.output_path
+        ]
+
+        # Execute ffmpeg command
+        subprocess.run(ffmpeg_cmd, check=True, capture_output=True)
+
+        # Clean up temporary files
+        for file in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, file))
+        os.rmdir(self.temp_dir)
+
+    def stop_recording(self, audio_path: str = None) -> bool:
+        """Stop recording and finalize the video file, with audio_path's WAV as its soundtrack.
+
+        Returns whether the video was saved complete; if not, error says why.
+        """
+        if self.recording or self.ffmpeg is not None:
+            if self.writer is not None:
+                self.stop_writer()
+
             try:
                 print("Processing recording...")
-                
-                # Construct ffmpeg command for video creation
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-y',  # Overwrite output file if it exists
-                    '-framerate', '60',
-                    '-i', os.path.join(self.temp_dir, 'frame_%06d.png'),
-                    '-c:v', 'libx264',
-                    '-preset', 'ultrafast',
-                    '-crf', '18',
-                    '-pix_fmt', 'yuv420p',
-                    os.path.join(self.output_dir, self.final_filename)
-                ]
-                
-                # Execute ffmpeg command
-                subprocess.run(ffmpeg_cmd, check=True, capture_output=True)
-                
-                print(f"Recording saved to {os.path.join(self.output_dir, self.final_filename)}")
+
+                if self.backend == 'pipe':
+                    self.finish_pipe()
+                    if audio_path is not None:
+                        # The video was encoded as it streamed in; only the audio is encoded here
+                        self.mux_audio(audio_path)
+                else:
+                    self.encode_png_frames(audio_path)
+
+                print(f"Recording saved to {self.output_path}")
                 print(f"Total frames recorded: {self.frame_count}")
-                
-                # Clean up temporary files
-                for file in os.listdir(self.temp_dir):
-                    os.remove(os.path.join(self.temp_dir, file))
-                os.rmdir(self.temp_dir)
-                
+
             except Exception as e:
                 print(f"Warning: Error while processing recording: {str(e)}")
-                print(f"Temporary files preserved in: {self.temp_dir}")
-            
-            self.recording = False
\ No newline at end of file
+                self.error = f"Error while processing recording: {str(e)}"
+                if self.temp_dir is not None:
+                    print(f"Temporary files preserved in: {self.temp_dir}")
+
+            if self.ffmpeg_log is not None:
+                self.ffmpeg_log.close()
+                self.ffmpeg_log = None
+            self.ffmpeg = None
+            self.recording = False
+        return self.error is None
@@ -0,0 +1,77 @@
+import struct
+from typing import List, Optional, Tuple
+
+MAGIC = b'CERP'
+VERSION = 2  # 2: ring indices are uint32
+
+# magic, version, seed, fps, config fingerprint, event count
+HEADER = struct.Struct('<4sHQd8sI')
+# type, frame, pos x, pos y, vel x, vel y, angular velocity
+BOUNCE = struct.Struct('<BI5d')
+# type, frame, ring index
+RING_DESTROYED = struct.Struct('<BII')
+
+BOUNCE_EVENT = 1
+RING_DESTROYED_EVENT = 2
+
+class ReplayLog:
+    """Compact binary log of the bounce and ring-destroy events of one run.
+
+    Together with the seed, fps and config fingerprint in the header this is
+    enough to re-render a run exactly: playback snaps the ball to each logged
+    bounce, so the trajectory cannot drift even if quality settings or the
+    machine change.
+    """
+
+    def __init__(self, seed: int, fps: float, fingerprint: bytes):
+        self.seed = seed
+        self.fps = fps
+        self.fingerprint = fingerprint
+        self.events: List[Tuple] = []
+        self.cursor = 0  # Next event to check during playback
+        self.diverged_at: Optional[int] = None
+
+    def record_bounce(self, frame: int, pos, vel, angular_velocity: float):
+        self.events.append((BOUNCE_EVENT, frame, pos.x, pos.y, vel.x, vel.y, angular_velocity))
+
+    def record_ring_destroyed(self, frame: int, ring_index: int):
+        self.events.append((RING_DESTROYED_EVENT, frame, ring_index))
+
+    def next_event(self, event_type: int, frame: int) -> Optional[Tuple]:
+        """During playback, consume the next logged event if it matches; else flag divergence"""
+        if self.diverged_at is not None:
+            return None
+        if self.cursor < len(self.events):
+            event = self.events[self.cursor]
+            if event[0] == event_type and event[1] == frame:
+                self.cursor += 1
+                return event
+        self.diverged_at = frame
+        print(f"Warning: replay diverged from the log at frame {frame}")
+        return None
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.fps, self.fingerprint, len(self.events)))
+            for event in self.events:
+                if event[0] == BOUNCE_EVENT:
+                    f.write(BOUNCE.pack(*event))
+                else:
+                    f.write(RING_DESTROYED.pack(*event))
+
+    @classmethod
+    def load(cls, path: str) -> 'ReplayLog':
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, seed, fps, fingerprint, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay log")
+
+        log = cls(seed, fps, fingerprint)
+        offset = HEADER.size
+        for _ in range(count):
+            event_type = data[offset]
+            layout = BOUNCE if event_type == BOUNCE_EVENT else RING_DESTROYED
+            log.events.append(layout.unpack_from(data, offset))
+            offset += layout.size
+        return log
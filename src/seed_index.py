@@ -0,0 +1,173 @@
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from src.config import GameConfig, SIMULATION_KEYS, config_fingerprint
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    id INTEGER PRIMARY KEY,
+    fingerprint BLOB NOT NULL,
+    fps INTEGER NOT NULL,
+    settings TEXT NOT NULL,
+    UNIQUE (fingerprint, fps)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    config_id INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    max_time REAL NOT NULL,
+    escaped INTEGER NOT NULL,
+    escape_time REAL,
+    frames INTEGER NOT NULL,
+    bounces INTEGER NOT NULL,
+    rings_destroyed INTEGER NOT NULL,
+    PRIMARY KEY (config_id, seed)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS runs_by_escape ON runs (config_id, escaped, escape_time);
+CREATE TABLE IF NOT EXISTS destroys (
+    config_id INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    ring INTEGER NOT NULL,
+    time REAL NOT NULL,
+    PRIMARY KEY (config_id, seed, ring)
+) WITHOUT ROWID;
+"""
+
+
+def simulate_seeds(config: GameConfig, seeds: List[int], fps: int, max_time: float) -> List[Tuple]:
+    """Simulate a chunk of seeds in a worker; return (run row, destroy rows) per seed"""
+    from src.simulation import BatchSimulation
+
+    outcomes = BatchSimulation(seeds, config=config).run(fps, max_time)
+    results = []
+    for k, seed in enumerate(seeds):
+        escaped = bool(outcomes['escaped'][k])
+        run = (seed, max_time, int(escaped),
+               float(outcomes['escape_time'][k]) if escaped else None,
+               int(outcomes['frames'][k]), int(outcomes['bounces'][k]),
+               int(outcomes['rings_destroyed'][k]))
+        destroys = [(seed, ring, float(outcomes['destroy_times'][k, ring]))
+                    for ring in range(int(outcomes['rings_destroyed'][k]))]
+        results.append((run, destroys))
+    return results
+
+
+class SeedIndex:
+    """On-disk index of simulated outcomes, keyed by config fingerprint, fps and seed.
+
+    Runs are filled in chunks by a process pool and committed as each chunk
+    finishes, so an interrupted fill keeps its progress and queries can run
+    while a fill is going (the database is in WAL mode).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+
+    def get_config_id(self, config: GameConfig, fps: int, create: bool = False):
+        fingerprint = config_fingerprint(config)
+        row = self.db.execute('SELECT id FROM configs WHERE fingerprint = ? AND fps = ?',
+                              (fingerprint, fps)).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        settings = json.dumps({key: config[key] for key in SIMULATION_KEYS}, sort_keys=True)
+        with self.db:
+            cursor = self.db.execute('INSERT INTO configs (fingerprint, fps, settings) VALUES (?, ?, ?)',
+                                     (fingerprint, fps, settings))
+        return cursor.lastrowid
+
+    def missing_seeds(self, config_id: int, seeds: range, max_time: float) -> List[int]:
+        """Seeds in the range not yet simulated for at least max_time seconds"""
+        done = {seed for (seed,) in self.db.execute(
+            'SELECT seed FROM runs WHERE config_id = ? AND seed BETWEEN ? AND ? '
+            'AND (escaped OR max_time >= ?)',
+            (config_id, seeds.start, seeds.stop - 1, max_time))}
+        return [seed for seed in seeds if seed not in done]
+
+    def store(self, config_id: int, results: List[Tuple]):
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(config_id,) + run for run, _ in results])
+            self.db.executemany(
+                'INSERT OR REPLACE INTO destroys VALUES (?, ?, ?, ?)',
+                [(config_id,) + row for _, destroys in results for row in destroys])
+
+    def fill(self, config: GameConfig, seeds: range, fps: int = 60, max_time: float = 120.0,
+             workers: int = None, chunk_size: int = 2000) -> int:
+        """Simulate every seed in the range that the index lacks; return how many were added"""
+        config_id = self.get_config_id(config, fps, create=True)
+        pending = self.missing_seeds(config_id, seeds, max_time)
+        workers = workers or os.cpu_count() or 1
+        # Smaller chunks when there is little to do, so every core gets some
+        chunk_size = max(1, min(chunk_size, math.ceil(len(pending) / workers)))
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        print(f"{len(seeds) - len(pending)} of {len(seeds)} seeds already indexed, "
+              f"simulating {len(pending)} in {len(chunks)} chunks on {workers} workers")
+
+        start = time.perf_counter()
+        added = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(simulate_seeds, config, chunk, fps, max_time) for chunk in chunks]
+            for done, future in enumerate(as_completed(futures), 1):
+                results = future.result()
+                self.store(config_id, results)
+                added += len(results)
+                elapsed = time.perf_counter() - start
+                print(f"[{done}/{len(chunks)}] {added} seeds indexed ({added / elapsed:.0f} seeds/s)")
+        return added
+
+    def query(self, config: GameConfig, fps: int = 60, min_escape: float = 0.0, max_escape: float = math.inf,
+              finale_rings: int = None, finale_within: float = None, max_bounces: int = None,
+              limit: int = 20) -> List[Dict]:
+        """Escaped runs whose escape time is in range, fastest first.
+
+        finale_rings/finale_within select runs where the last finale_rings
+        rings were all destroyed within finale_within seconds; finale_rings
+        is required with finale_within and must be between 1 and config.rings.
+        """
+        if finale_within is not None and finale_rings is None:
+            raise ValueError("finale_within needs finale_rings")
+        if finale_rings is not None and not 1 <= finale_rings <= config.rings:
+            raise ValueError(f"finale_rings must be between 1 and {config.rings}, got {finale_rings}")
+        config_id = self.get_config_id(config, fps)
+        if config_id is None:
+            return []
+
+        sql = ('SELECT r.seed, r.escape_time, r.bounces, r.escape_time - d.time '
+               'FROM runs r LEFT JOIN destroys d '
+               'ON d.config_id = r.config_id AND d.seed = r.seed AND d.ring = ? '
+               'WHERE r.config_id = ? AND r.escaped AND r.escape_time BETWEEN ? AND ?')
+        first_finale_ring = config.rings - (finale_rings or 1)
+        params = [first_finale_ring, config_id, min_escape, max_escape]
+        if finale_within is not None:
+            sql += ' AND r.escape_time - d.time <= ?'
+            params.append(finale_within)
+        if max_bounces is not None:
+            sql += ' AND r.bounces <= ?'
+            params.append(max_bounces)
+        sql += ' ORDER BY r.escape_time LIMIT ?'
+        params.append(limit)
+
+        return [{'seed': seed, 'escape_time': escape_time, 'bounces': bounces, 'finale': finale}
+                for seed, escape_time, bounces, finale in self.db.execute(sql, params)]
+
+    def count(self, config: GameConfig, fps: int = 60) -> Tuple[int, int]:
+        """(runs indexed, runs escaped) for a config"""
+        config_id = self.get_config_id(config, fps)
+        if config_id is None:
+            return 0, 0
+        total, escaped = self.db.execute('SELECT COUNT(*), COALESCE(SUM(escaped), 0) FROM runs '
+                                         'WHERE config_id = ?', (config_id,)).fetchone()
+        return total, escaped
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,244 @@
+import math
+import numpy as np
+from typing import Dict, Sequence, Union
+from src.config import GameConfig, snapshot_config
+from src.utils.collision import times_to_reach_radius, MAX_IMPACTS_PER_STEP
+from src.utils.rng import MASK64, random_at
+
+# Ring.gap_tolerance: extra radians either side of the gap that still count as in it
+GAP_TOLERANCE = 0.1
+
+class BatchSimulation:
+    """Many independent games stepped together as NumPy arrays, without pygame.
+
+    Mirrors the swept simulation of Game: Ball.bounce, the rotation of
+    Ring.update, Ring.is_ball_in_gap and Game.sweep_ball, including every
+    SeededRandom draw, so game k plays out as Game(seed=seeds[k]) does under
+    run_headless at the same fps. Each step only resolves impacts for the
+    games that have one; everything else is a handful of array operations
+    over the whole batch.
+
+    Drawing, particles and audio are not simulated. They never feed back
+    into the trajectory.
+    """
+
+    record_destroy_times = True  # Keep the games x rings destroy_times matrix for outcomes()
+
+    def __init__(self, seeds: Sequence[int], config: Union[GameConfig, Dict] = None,
+                 ball_radius: float = None):
+        if config is None:
+            config = snapshot_config()
+        elif isinstance(config, dict):
+            config = GameConfig.from_dict(config)
+        if not config.swept_collisions:
+            raise ValueError("BatchSimulation only mirrors swept collisions")
+        self.config = config
+        self.seeds = np.array([seed & MASK64 for seed in seeds], dtype=np.uint64)
+        count = len(self.seeds)
+
+        # Rings exactly as Game.setup_rings lays them out
+        self.center_x = config.width / 2
+        self.center_y = config.height / 2
+        ring_count = config.rings
+        self.ring_radius = np.array([50 + i * config.spacing for i in range(ring_count)])
+        self.ring_rotation = np.array([i * config.offset for i in range(ring_count)])
+        self.ring_speed = np.array([config.rotation * (1 + i * config.offset)
+                                    for i in range(ring_count)])
+        self.two_pi = math.pi * 2
+        half_gap = config.gap_size / 2
+        self.gap_low = half_gap + GAP_TOLERANCE
+        self.gap_high = self.two_pi - half_gap - GAP_TOLERANCE
+
+        if ball_radius is None:
+            # Game's ball takes the icon's size when the icon is used
+            ball_radius = config.icon_size / 2 if config.use_icon else 8
+
+        # Ball state, one entry per game; start_game's launch straight up
+        self.pos_x = np.full(count, self.center_x)
+        self.pos_y = np.full(count, self.center_y)
+        self.vel_x = np.zeros(count)
+        self.vel_y = np.full(count, -1.0 * config.ball_speed)
+        self.radius = np.full(count, float(ball_radius))
+        self.ball_time = np.zeros(count)
+        self.draws = np.full(count, 2, dtype=np.uint64)  # Ball.__init__ draws a velocity start_game replaces
+
+        # Ball.is_edge_rolling state
+        self.last_bounce_x = np.zeros(count)
+        self.last_bounce_y = np.zeros(count)
+        self.has_bounced = np.zeros(count, dtype=bool)
+        self.last_bounce_time = np.zeros(count)
+        self.consecutive_bounces = np.zeros(count, dtype=np.int64)
+
+        # Outcomes
+        self.active_ring = np.zeros(count, dtype=np.int64)
+        self.won = np.zeros(count, dtype=bool)
+        self.frames = np.zeros(count, dtype=np.int64)
+        self.bounces = np.zeros(count, dtype=np.int64)
+        self.destroy_times = np.full((count, ring_count), np.nan) if self.record_destroy_times else None
+
+    def uniform(self, games: np.ndarray, a, b) -> np.ndarray:
+        """SeededRandom.uniform for each of the given games, advancing their streams"""
+        values = random_at(self.seeds[games], self.draws[games])
+        self.draws[games] += np.uint64(1)
+        return a + (b - a) * values
+
+    def bounce(self, games: np.ndarray):
+        """Ball.bounce off the ring for every given game, then Ball.grow"""
+        config = self.config
+        ball_speed = config.ball_speed
+
+        # (center - pos).normalize()
+        normal_x = self.center_x - self.pos_x[games]
+        normal_y = self.center_y - self.pos_y[games]
+        length = np.sqrt(normal_x * normal_x + normal_y * normal_y)
+        safe = np.where(length == 0, 1.0, length)
+        normal_x = np.where(length == 0, 0.0, normal_x / safe)
+        normal_y = np.where(length == 0, 0.0, normal_y / safe)
+        perpendicular_x, perpendicular_y = -normal_y, normal_x
+
+        # Ball.is_edge_rolling
+        pos_x, pos_y, now = self.pos_x[games], self.pos_y[games], self.ball_time[games]
+        offset_x = pos_x - self.last_bounce_x[games]
+        offset_y = pos_y - self.last_bounce_y[games]
+        distance_to_last = np.sqrt(offset_x * offset_x + offset_y * offset_y)
+        time_since_last = now - self.last_bounce_time[games]
+        close = (distance_to_last < self.radius[games] * 4) & (time_since_last < 0.1)
+        has_bounced = self.has_bounced[games]
+        consecutive = np.where(has_bounced, np.where(close, self.consecutive_bounces[games] + 1, 0),
+                               self.consecutive_bounces[games])
+        self.last_bounce_x[games] = pos_x
+        self.last_bounce_y[games] = pos_y
+        self.last_bounce_time[games] = now
+        self.has_bounced[games] = True
+        rolling = consecutive >= 2
+        consecutive[rolling] = 0
+        self.consecutive_bounces[games] = consecutive
+
+        vel_x, vel_y = self.vel_x[games], self.vel_y[games]
+        new_x, new_y = vel_x.copy(), vel_y.copy()
+
+        # Edge rolling: Ball.get_escape_vector
+        pick = rolling
+        if pick.any():
+            angle = self.uniform(games[pick], 30, 60) * (math.pi / 180.0)
+            cos, sin = np.cos(angle), np.sin(angle)
+            escape_x = normal_x[pick] * cos + perpendicular_x[pick] * sin
+            escape_y = normal_y[pick] * cos + perpendicular_y[pick] * sin
+            length = np.sqrt(escape_x * escape_x + escape_y * escape_y)
+            new_x[pick] = escape_x / length * (ball_speed * 1.2)
+            new_y[pick] = escape_y / length * (ball_speed * 1.2)
+
+        speed = np.sqrt(vel_x * vel_x + vel_y * vel_y)
+        dot_product = vel_x * normal_x + vel_y * normal_y
+        with np.errstate(invalid='ignore', divide='ignore'):
+            bounce_angle = np.arccos(np.clip(dot_product / speed, -1.0, 1.0)) * (180.0 / math.pi)
+
+        # Shallow bounces are pushed out to the minimum angle
+        pick = ~rolling & (bounce_angle < config.minimum_bounce_angle)
+        if pick.any():
+            picked = games[pick]
+            sign = np.where(vel_x[pick] * perpendicular_x[pick] + vel_y[pick] * perpendicular_y[pick] > 0, 1, -1)
+            angle = (config.minimum_bounce_angle + self.uniform(picked, 10, 25)) * (math.pi / 180.0)
+            cos, sin = np.cos(angle), np.sin(angle)
+            direction_x = normal_x[pick] * cos + sign * perpendicular_x[pick] * sin
+            direction_y = normal_y[pick] * cos + sign * perpendicular_y[pick] * sin
+            length = np.sqrt(direction_x * direction_x + direction_y * direction_y)
+            scale = ball_speed * self.uniform(picked, 1.0, 1.2)
+            new_x[pick] = direction_x / length * scale
+            new_y[pick] = direction_y / length * scale
+
+        # Regular bounces leave along the normal, turned by a random angle
+        pick = ~rolling & ~(bounce_angle < config.minimum_bounce_angle)
+        if pick.any():
+            picked = games[pick]
+            head_on = (bounce_angle[pick] < 45) | (bounce_angle[pick] > 135)
+            values = random_at(self.seeds[picked], self.draws[picked])
+            self.draws[picked] += np.uint64(1)
+            random_angle = np.where(head_on, -15 + (15 - -15) * values, -5 + (5 - -5) * values)
+            angle = random_angle * (math.pi / 180.0)
+            cos, sin = np.cos(angle), np.sin(angle)
+            rotated_x = normal_x[pick] * cos - normal_y[pick] * sin
+            rotated_y = normal_x[pick] * sin + normal_y[pick] * cos
+            new_speed = np.maximum(speed[pick] * self.uniform(picked, 0.95, 1.05), ball_speed * 0.8)
+            length = np.sqrt(rotated_x * rotated_x + rotated_y * rotated_y)
+            new_x[pick] = rotated_x / length * new_speed
+            new_y[pick] = rotated_y / length * new_speed
+
+        self.vel_x[games] = new_x
+        self.vel_y[games] = new_y
+
+        if config.tumble:
+            # Tumble direction and speed only affect drawing, but consume two draws
+            self.draws[games] += np.uint64(2)
+        if config.grow:
+            self.radius[games] += config.grow_size
+        self.bounces[games] += 1
+
+    def step(self, dt: float):
+        """One fixed step of Game.update_game_state for every game still playing"""
+        live = np.flatnonzero(~self.won)
+        if live.size == 0:
+            return
+        self.frames[live] += 1
+        self.ring_rotation += self.ring_speed * dt
+        if self.config.gravity != 0.0:
+            self.vel_y[live] += self.config.gravity * dt
+
+        # Game.sweep_ball, resolving one impact per game per pass
+        remaining = np.zeros(len(self.seeds))
+        remaining[live] = dt
+        games = live
+        thickness = self.config.thickness
+        for _ in range(MAX_IMPACTS_PER_STEP):
+            games = games[self.active_ring[games] < len(self.ring_radius)]
+            if games.size == 0:
+                break
+            ring = self.active_ring[games]
+            contact_radius = self.ring_radius[ring] - (self.radius[games] + thickness)
+            t = times_to_reach_radius(self.pos_x[games] - self.center_x, self.pos_y[games] - self.center_y,
+                                      self.vel_x[games], self.vel_y[games], contact_radius, remaining[games])
+            hit = ~np.isnan(t)
+            games, ring, t = games[hit], ring[hit], t[hit]
+            if games.size == 0:
+                break
+
+            self.pos_x[games] += self.vel_x[games] * t
+            self.pos_y[games] += self.vel_y[games] * t
+            self.ball_time[games] += t
+            remaining[games] -= t
+
+            angle = np.arctan2(self.center_y - self.pos_y[games], self.pos_x[games] - self.center_x) % self.two_pi
+            rotation = self.ring_rotation[ring] - self.ring_speed[ring] * remaining[games]
+            normalized = (angle - rotation) % self.two_pi
+            in_gap = (normalized <= self.gap_low) | (normalized >= self.gap_high)
+
+            escaped = games[in_gap]
+            self.destroy_times[escaped, ring[in_gap]] = self.ball_time[escaped]
+            self.active_ring[escaped] += 1
+            self.bounce(games[~in_gap])
+
+        self.pos_x[live] += self.vel_x[live] * remaining[live]
+        self.pos_y[live] += self.vel_y[live] * remaining[live]
+        self.ball_time[live] += remaining[live]
+        self.won[live] = self.active_ring[live] >= len(self.ring_radius)
+
+    def run(self, fps: int = 60, max_time: float = 120.0) -> Dict[str, np.ndarray]:
+        """Step every game until it escapes or max_time simulated seconds pass, as run_headless does"""
+        dt = 1.0 / fps
+        frame = 0
+        while not self.won.all() and frame * dt < max_time:
+            self.step(dt)
+            frame += 1
+        return self.outcomes()
+
+    def outcomes(self) -> Dict[str, np.ndarray]:
+        """Per-game results; times are simulated seconds, NaN where it has not happened"""
+        return {
+            'seed': self.seeds,
+            'escaped': self.won.copy(),
+            'escape_time': self.destroy_times[:, -1].copy(),
+            'frames': self.frames.copy(),
+            'bounces': self.bounces.copy(),
+            'rings_destroyed': self.active_ring.copy(),
+            'destroy_times': self.destroy_times.copy(),
+        }
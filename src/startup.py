@@ -0,0 +1,46 @@
+import contextlib
+import time
+from typing import Dict, List
+
+class StartupReport:
+    """Wall time of each import and initialization stage of a run.
+
+    Startup is timed as laps: lap(name) charges the time since the previous
+    lap, or since the report was created, to name, the way FrameProfiler
+    times frame phases. Setup the game defers until first use (sounds, the
+    video background) is timed with stage(name) whenever it happens, and
+    reported as deferred rather than charged to whatever it interrupted.
+    """
+
+    def __init__(self):
+        self.created = self.last_lap = time.perf_counter()
+        self.stages: List[Dict] = []  # {'name', 'seconds', 'deferred'} in the order they ran
+
+    def lap(self, name: str):
+        now = time.perf_counter()
+        self.stages.append({'name': name, 'seconds': now - self.last_lap, 'deferred': False})
+        self.last_lap = now
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages.append({'name': name, 'seconds': seconds, 'deferred': True})
+            # Keep it out of the lap it interrupted
+            self.last_lap += seconds
+
+    def startup_time(self) -> float:
+        """Seconds spent in laps, excluding deferred stages"""
+        return sum(stage['seconds'] for stage in self.stages if not stage['deferred'])
+
+    def print_report(self):
+        print("Startup:")
+        for stage in self.stages:
+            print(f"  {stage['name']:<24} {stage['seconds'] * 1000:8.1f} ms"
+                  + ("  (deferred)" if stage['deferred'] else ""))
+        deferred = sum(stage['seconds'] for stage in self.stages if stage['deferred'])
+        print(f"  {'total':<24} {self.startup_time() * 1000:8.1f} ms, "
+              f"{deferred * 1000:.1f} ms deferred until first use")
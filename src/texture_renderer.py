@@ -0,0 +1,210 @@
+import sys
+import numpy as np
+import pygame
+from pygame._sdl2.video import Renderer, Texture, Window
+from typing import Dict, Tuple
+from src.compositor import RingLayer
+from src.utils.video_cache import draw_frame
+
+BLEND_NONE = 0
+BLEND_ALPHA = 1  # SDL_BLENDMODE_BLEND
+
+class TextureRenderer:
+    """Draws the game with pygame._sdl2's Renderer and Textures instead of Surface blits.
+
+    Every sprite is a texture uploaded once and drawn with per-draw
+    parameters: circles are one white texture per quantized radius,
+    tinted with the color and alpha modulation of each draw; the icon is
+    a single texture drawn with an angle, where the software path keeps
+    a RotationAtlas of 360 pre-rotated copies. Rings are still painted by
+    RingSet into a persistent alpha layer, and only the area that changed
+    since the last frame is uploaded to its texture.
+
+    Works with any SDL render driver, including the software renderer
+    used under the dummy video driver in headless runs. The game's
+    screen is an off-screen surface; it receives the video background
+    before upload, and the finished frame is read back into it only when
+    the game is recording.
+    """
+
+    def __init__(self, game, title: str = "Circle Escape"):
+        self.game = game
+        self.size = game.screen.get_size()
+        self.window = Window(title, self.size)
+        try:
+            self.renderer = Renderer(self.window)
+        except pygame.error:
+            # No hardware driver could be opened; SDL's software renderer draws the same textures
+            self.renderer = Renderer(self.window, accelerated=0)
+
+        self.background = Texture(self.renderer, self.size, streaming=True)
+        self.background.blend_mode = BLEND_NONE
+        # Video frames are screen pixels; an XRGB screen is B, G, R, X in little-endian memory
+        self.frame_format = None
+        if sys.byteorder == 'little' and game.screen.get_masks()[:3] == (0xff0000, 0xff00, 0xff):
+            self.frame_format = 'BGRA'
+        self.ring_layer = RingLayer(game, pygame.Surface(self.size, pygame.SRCALPHA, 32), (0, 0, 0, 0))
+        self.ring_texture = Texture(self.renderer, self.size, streaming=True)
+        self.ring_texture.blend_mode = BLEND_ALPHA
+        # Only the square around the rings is drawn; blending the rest would cost the
+        # software renderer a full-screen pass for nothing
+        outer = int(game.rings.radius.max(initial=0)) + 2
+        self.ring_area = pygame.Rect(int(game.center.x) - outer, int(game.center.y) - outer,
+                                     outer * 2 + 1, outer * 2 + 1).clip(self.ring_layer.surface.get_rect())
+        self.valid = False  # The ring layer needs a full paint and upload
+
+        self.circles: Dict[int, Texture] = {}  # White circle per quantized radius
+        self.icon = None
+        self.icon_source = None  # The icon surface self.icon was made from
+        self.overlays: Dict[str, Texture] = {}
+        self.profiler_overlay = None
+        self.profiler_source = None
+
+    def circle(self, radius_index: int) -> Texture:
+        texture = self.circles.get(radius_index)
+        if texture is None:
+            cache = self.game.sprite_cache
+            surface = cache.get_circle(radius_index, (255, 255, 255), cache.alpha_levels - 1)
+            texture = self.circles[radius_index] = Texture.from_surface(self.renderer, surface)
+            texture.blend_mode = BLEND_ALPHA
+        return texture
+
+    def draw_circle(self, radius_index: int, color: Tuple[int, int, int], alpha: int, x: float, y: float):
+        """A circle centered on (x, y), placed the way SpriteCache sprites are blitted"""
+        texture = self.circle(radius_index)
+        texture.color = color
+        texture.alpha = alpha
+        half_size = texture.width / 2
+        texture.draw(dstrect=(int(x - half_size), int(y - half_size)))
+
+    def draw_rings(self):
+        layer = self.ring_layer
+        if not self.valid:
+            layer.rebuild()
+            rects = [layer.surface.get_rect()]
+            self.valid = True
+        else:
+            rects = layer.update()
+        if rects:
+            # One upload covering every change beats one per ring run
+            area = rects[0].unionall(rects[1:]).clip(layer.surface.get_rect())
+            if area.width > 0 and area.height > 0:
+                self.ring_texture.update(layer.surface.subsurface(area), area)
+        self.ring_texture.draw(srcrect=self.ring_area, dstrect=self.ring_area)
+
+    def draw_particles(self):
+        particles = self.game.particles
+        n = particles.count
+        if n == 0:
+            return
+        # The buckets ParticleSystem.draw uses, with color and alpha applied per draw
+        cache = self.game.sprite_cache
+        radius_index, alpha_index, color, keys = particles.quantize()
+        alpha = np.rint(alpha_index * 255 / (cache.alpha_levels - 1)).astype(np.int64)
+
+        # Set each texture's modulation once per group of particles that share it
+        order = np.argsort(keys, kind='stable')
+        starts = np.flatnonzero(np.diff(keys[order], prepend=-1))
+        ends = np.append(starts[1:], n)
+        positions = particles.pos[:n]
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            first = order[start]
+            texture = self.circle(int(radius_index[first]))
+            texture.color = tuple(int(c) for c in color[first])
+            texture.alpha = int(alpha[first])
+            half_size = texture.width / 2
+            for x, y in (positions[order[start:end]] - half_size).astype(np.int64).tolist():
+                texture.draw(dstrect=(x, y))
+
+    def get_icon(self):
+        atlas = self.game.ball.icon_atlas
+        if atlas is None:
+            return None
+        if self.icon_source is not atlas.image:
+            self.icon = Texture.from_surface(self.renderer, atlas.image)
+            self.icon.blend_mode = BLEND_ALPHA
+            self.icon_source = atlas.image
+        return self.icon
+
+    def draw_icon(self, icon: Texture, angle: float, x: float, y: float, alpha: int):
+        """The icon turned counterclockwise by angle degrees, as pygame.transform.rotate turns it"""
+        icon.alpha = alpha
+        icon.draw(dstrect=(round(x - icon.width / 2), round(y - icon.height / 2), icon.width, icon.height),
+                  angle=-angle)
+
+    def draw_balls(self):
+        game = self.game
+        cache = game.sprite_cache
+        if game.swarm is not None:
+            swarm = game.swarm
+            radius_index = np.maximum(1, np.rint(swarm.radius / cache.radius_step)).astype(np.int64).tolist()
+            for i, (x, y) in enumerate(zip(swarm.pos_x.tolist(), swarm.pos_y.tolist())):
+                self.draw_circle(radius_index[i], swarm.colors[swarm.color_index[i]], 255, x, y)
+            return
+
+        ball = game.ball
+        icon = self.get_icon()
+        for pos, alpha, rotation in ball.trail:
+            if icon is None:
+                radius_index, alpha_index = cache.quantize(ball.radius * alpha, 255 * alpha)
+                self.draw_circle(radius_index, (255, 255, 255),
+                                 round(alpha_index * 255 / (cache.alpha_levels - 1)), pos.x, pos.y)
+            else:
+                self.draw_icon(icon, rotation, pos.x, pos.y, int(255 * alpha))
+        if icon is None:
+            radius_index, _ = cache.quantize(int(ball.radius), 255)
+            self.draw_circle(radius_index, (255, 255, 255), 255, int(ball.pos.x), int(ball.pos.y))
+        else:
+            self.draw_icon(icon, ball.rotation, ball.pos.x, ball.pos.y, 255)
+
+    def draw_overlays(self):
+        game = self.game
+        text = game.get_overlay_text()
+        if text is not None:
+            surface, rect = game.render_overlay()
+            texture = self.overlays.get(text)
+            if texture is None:
+                texture = self.overlays[text] = Texture.from_surface(self.renderer, surface)
+                texture.blend_mode = BLEND_ALPHA
+            texture.draw(dstrect=rect)
+
+        profiler = game.profiler
+        if profiler is not None and profiler.visible:
+            surface, rect = profiler.get_overlay()
+            if surface is not self.profiler_source:
+                # Re-rendered twice a second at most, so re-uploaded as often
+                self.profiler_overlay = Texture.from_surface(self.renderer, surface)
+                self.profiler_overlay.blend_mode = BLEND_ALPHA
+                self.profiler_source = surface
+            self.profiler_overlay.draw(dstrect=surface.get_rect(topleft=rect.topleft))
+
+    def draw_background(self, frame: np.ndarray):
+        screen = self.game.screen
+        if self.frame_format is not None:
+            # Upload straight from the frame's memory
+            self.background.update(pygame.image.frombuffer(frame, self.size, self.frame_format))
+        else:
+            draw_frame(screen, frame)
+            self.background.update(screen)
+        self.background.draw()
+
+    def draw(self):
+        game = self.game
+        renderer = self.renderer
+        if game.bg_frame is not None:
+            self.draw_background(game.bg_frame)
+        else:
+            renderer.draw_color = (0, 0, 0, 255)
+            renderer.clear()
+
+        self.draw_rings()
+        self.draw_particles()
+        self.draw_balls()
+        self.draw_overlays()
+        if game.recorder is not None:
+            # The back buffer is undefined after present, so read the frame back first
+            renderer.to_surface(game.screen)
+        game.lap('draw')
+
+        renderer.present()
+        game.lap('flip')
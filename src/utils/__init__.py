@@ -1,3 +1,18 @@
 from .vector import Vector2
+from .rng import SeededRandom
 
-__all__ = ['Vector2'] 
\ No newline at end of file
+__all__ = ['Vector2', 'SeededRandom', 'SpriteCache', 'RotationAtlas', 'VideoCache']
+
+def __getattr__(name):
+    # The sprite helpers need pygame; import them on first use so the math
+    # modules here stay importable without it (see src/simulation.py)
+    if name == 'SpriteCache':
+        from .sprite_cache import SpriteCache
+        return SpriteCache
+    if name == 'RotationAtlas':
+        from .rotation_atlas import RotationAtlas
+        return RotationAtlas
+    if name == 'VideoCache':
+        from .video_cache import VideoCache
+        return VideoCache
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,49 @@
+import math
+import numpy as np
+from typing import Optional
+
+# Safety cap on ring impacts resolved within one swept step
+MAX_IMPACTS_PER_STEP = 32
+
+def time_to_reach_radius(px: float, py: float, vx: float, vy: float,
+                         radius: float, max_time: float) -> Optional[float]:
+    """Time at which a point moving in a straight line leaves a circle.
+
+    (px, py) is the point relative to the circle's center and (vx, vy) its
+    velocity. Returns the first t in [0, max_time] where the point is on
+    the circle moving outward, or None if that does not happen within the
+    step. A point already on or outside the circle and moving outward
+    returns 0.
+    """
+    a = vx * vx + vy * vy
+    if a == 0.0:
+        return None
+    b = px * vx + py * vy  # Half the linear coefficient
+    c = px * px + py * py - radius * radius
+
+    if c >= 0.0 and b > 0.0:
+        return 0.0
+
+    discriminant = b * b - a * c
+    if discriminant < 0.0:
+        return None  # Passes entirely outside the circle
+    t = (-b + math.sqrt(discriminant)) / a  # The outward crossing is the later root
+    if t < 0.0 or t > max_time:
+        return None
+    return t
+
+def times_to_reach_radius(px: np.ndarray, py: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                          radius: np.ndarray, max_time: np.ndarray) -> np.ndarray:
+    """Vectorized time_to_reach_radius, with NaN where it would return None.
+
+    Evaluates the same expressions in the same order, so each element is
+    bit-for-bit the scalar result.
+    """
+    a = vx * vx + vy * vy
+    b = px * vx + py * vy
+    c = px * px + py * py - radius * radius
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-b + np.sqrt(b * b - a * c)) / a
+    t = np.where((c >= 0.0) & (b > 0.0), 0.0, t)
+    return np.where((a != 0.0) & (t >= 0.0) & (t <= max_time), t, np.nan)
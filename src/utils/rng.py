@@ -0,0 +1,54 @@
+import random
+import numpy as np
+from typing import Sequence
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+def splitmix64(value: int) -> int:
+    """SplitMix64 finalizer: a well-mixed 64-bit hash of value"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+class SeededRandom:
+    """Per-game random stream, reproducible from its seed alone.
+
+    Draw k of a stream is splitmix64(seed + (k + 1) * golden gamma), so the
+    stream depends only on (seed, k). A vectorized simulator can then
+    reproduce any game's draws with plain uint64 array arithmetic.
+    """
+
+    def __init__(self, seed: int = None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        # Any int names a seed; negative ones wrap to the uint64 the header and numpy can take
+        self.seed = seed & MASK64
+        self.state = self.seed
+        self.draws = 0
+
+    def next_u64(self) -> int:
+        self.state = (self.state + GOLDEN_GAMMA) & MASK64
+        self.draws += 1
+        return splitmix64(self.state)
+
+    def random(self) -> float:
+        """Uniform float in [0, 1) with 53 bits of precision"""
+        return (self.next_u64() >> 11) * (1.0 / (1 << 53))
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def choice(self, options: Sequence):
+        return options[int(self.random() * len(options))]
+
+def splitmix64_array(values: np.ndarray) -> np.ndarray:
+    """splitmix64 over a uint64 array; multiplications wrap like the & MASK64 above"""
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+def random_at(seeds: np.ndarray, draws: np.ndarray) -> np.ndarray:
+    """SeededRandom(seed).random() after `draws` earlier draws, for arrays of uint64 seeds and counts"""
+    states = seeds + (draws + np.uint64(1)) * np.uint64(GOLDEN_GAMMA)
+    return (splitmix64_array(states) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
@@ -0,0 +1,36 @@
+import pygame
+from typing import List, Optional, Tuple
+
+class RotationAtlas:
+    """An image rotated into `steps` evenly spaced angles, each built on first use.
+
+    Drawing at any angle becomes a lookup plus a blit. Fading is applied
+    as surface alpha on the shared frame at blit time, so trail copies
+    need neither a rotation nor a surface copy.
+    """
+
+    def __init__(self, image: pygame.Surface, steps: int = 360):
+        self.image = image
+        self.steps = steps
+        # (rotated image, its rect centered on the origin) per step, None until first drawn
+        self.frames: List[Optional[Tuple[pygame.Surface, pygame.Rect]]] = [None] * steps
+
+    def frame(self, i: int) -> Tuple[pygame.Surface, pygame.Rect]:
+        frame = self.frames[i]
+        if frame is None:
+            rotated = pygame.transform.rotate(self.image, i * 360 / self.steps)
+            frame = self.frames[i] = (rotated, rotated.get_rect(center=(0, 0)))
+        return frame
+
+    def index(self, angle: float) -> int:
+        """Nearest pre-rotated frame for an angle in degrees"""
+        return round(angle * self.steps / 360) % self.steps
+
+    def get(self, angle: float) -> Tuple[pygame.Surface, pygame.Rect]:
+        return self.frame(self.index(angle))
+
+    def blit(self, screen: pygame.Surface, angle: float, center: Tuple[float, float], alpha: int = 255):
+        """Draw the image rotated by angle degrees, centered on center"""
+        frame, rect = self.frame(self.index(angle))
+        frame.set_alpha(alpha)
+        screen.blit(frame, rect.move(round(center[0]), round(center[1])))
@@ -0,0 +1,73 @@
+import math
+import pygame
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered sprites.
+
+    Alpha-faded circles are keyed by quantized radius, color and alpha so
+    particles and the ball trail can reuse surfaces instead of allocating
+    one per blit. The hit/miss counters show how well the quantization
+    trades accuracy for reuse.
+    """
+
+    def __init__(self, max_size: int = 4096, radius_step: float = 0.5, alpha_levels: int = 32):
+        self.max_size = max_size
+        self.radius_step = radius_step
+        self.alpha_levels = alpha_levels
+        self.sprites: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, factory: Callable[[], pygame.Surface]) -> pygame.Surface:
+        """Return the cached sprite for key, rendering it with factory on a miss"""
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = factory()
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def quantize(self, radius: float, alpha: float) -> Tuple[int, int]:
+        """Map a radius in pixels and an alpha in 0-255 to cache buckets"""
+        radius_index = max(1, round(radius / self.radius_step))
+        alpha_index = round(max(0.0, min(255.0, alpha)) * (self.alpha_levels - 1) / 255)
+        return radius_index, alpha_index
+
+    def circle(self, radius: float, color: Tuple[int, int, int], alpha: float) -> pygame.Surface:
+        """Faded circle sprite centered in a square surface"""
+        radius_index, alpha_index = self.quantize(radius, alpha)
+        return self.get_circle(radius_index, color, alpha_index)
+
+    def get_circle(self, radius_index: int, color: Tuple[int, int, int], alpha_index: int) -> pygame.Surface:
+        """Faded circle sprite for already-quantized buckets"""
+        key = ('circle', radius_index, color, alpha_index)
+
+        def render() -> pygame.Surface:
+            radius = radius_index * self.radius_step
+            size = max(1, math.ceil(radius * 2))
+            alpha = round(alpha_index * 255 / (self.alpha_levels - 1))
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (size / 2, size / 2), radius)
+            return surf
+
+        return self.get(key, render)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.sprites),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
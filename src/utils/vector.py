@@ -3,23 +3,71 @@ from dataclasses import dataclass
 
 @dataclass
 class Vector2:
+    """2D vector for the simulation.
+
+    The binary operators return new vectors. The in-place forms (+=, -=,
+    *=, add_scaled_ip, normalize_ip, update) mutate and allocate nothing,
+    so anything that may be shared must be copied before it is mutated.
+    """
+    __slots__ = ('x', 'y')
     x: float
     y: float
-    
+
     def __add__(self, other):
         return Vector2(self.x + other.x, self.y + other.y)
-    
+
     def __sub__(self, other):
         return Vector2(self.x - other.x, self.y - other.y)
-    
+
     def __mul__(self, scalar):
         return Vector2(self.x * scalar, self.y * scalar)
-    
+
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def add_scaled_ip(self, other, scalar: float):
+        """self += other * scalar without the temporary"""
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+
+    def update(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    def copy(self):
+        return Vector2(self.x, self.y)
+
+    def dot(self, other) -> float:
+        return self.x * other.x + self.y * other.y
+
+    def length_squared(self) -> float:
+        return self.x * self.x + self.y * self.y
+
     def length(self):
         return math.sqrt(self.x * self.x + self.y * self.y)
-    
+
     def normalize(self):
         length = self.length()
         if length == 0:
             return Vector2(0, 0)
-        return Vector2(self.x / length, self.y / length) 
\ No newline at end of file
+        return Vector2(self.x / length, self.y / length)
+
+    def normalize_ip(self):
+        length = self.length()
+        if length == 0:
+            self.x = self.y = 0
+        else:
+            self.x /= length
+            self.y /= length
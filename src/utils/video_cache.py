@@ -0,0 +1,135 @@
+import hashlib
+import os
+
+import numpy as np
+import pygame
+from src.entities.ring import get_pixel_rows
+
+class FrameCompositor:
+    """Turns a decoded BGR video frame into screen pixels.
+
+    The frame is scaled to the screen height, center-cropped, faded to the
+    opacity and laid over black, then written in the screen's pixel format
+    so it can be copied straight into the screen.
+    """
+
+    def __init__(self, screen: pygame.Surface, opacity: float):
+        if screen.get_bitsize() != 32:
+            raise ValueError("Video backgrounds need a 32-bit screen")
+        self.width, self.height = screen.get_size()
+        self.composited = pygame.Surface((self.width, self.height), 0, screen)
+        self.alpha_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        self.alpha_surface.fill((255, 255, 255, int(255 * opacity)))
+
+    def composite(self, frame: np.ndarray, out: np.ndarray):
+        """Write the screen pixels for a cv2 frame into out, a flat uint32 array"""
+        import cv2
+
+        # Scale to the screen height, keeping the aspect ratio, and center horizontally
+        scale_factor = self.height / frame.shape[0]
+        new_width = int(frame.shape[1] * scale_factor)
+        frame = cv2.resize(frame, (new_width, self.height))
+        x_offset = max(0, (new_width - self.width) // 2)
+        frame = frame[:, x_offset:x_offset + self.width] if new_width > self.width else frame
+
+        # Fade the frame to the background opacity over black
+        video_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        video_surface.blit(pygame.surfarray.make_surface(frame_rgb.swapaxes(0, 1)), (0, 0))
+        video_surface.blit(self.alpha_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        self.composited.fill((0, 0, 0))
+        self.composited.blit(video_surface, (0, 0))
+
+        pixels = get_pixel_rows(self.composited)
+        if pixels is None:
+            pixels = pygame.surfarray.pixels2d(self.composited).T.reshape(-1)
+        np.copyto(out, pixels, casting='unsafe')
+        del pixels
+
+
+def draw_frame(screen: pygame.Surface, frame: np.ndarray):
+    """Copy a flat frame of screen pixels over the whole screen"""
+    pixels = get_pixel_rows(screen)
+    if pixels is not None:
+        np.copyto(pixels, frame)
+        del pixels
+    else:
+        width, height = screen.get_size()
+        pygame.surfarray.blit_array(screen, frame.reshape(height, width).T)
+
+
+class VideoCache:
+    """Background video pre-rendered to a memory-mapped file of screen-ready frames.
+
+    Each frame is stored the way Game used to composite it every frame:
+    scaled to the screen height, center-cropped, faded to the configured
+    opacity and laid over black, in the screen's own pixel format. Drawing
+    a frame is then a single copy from the mapped file into the screen.
+    The file is keyed by the video's contents, the screen size and format
+    and the opacity, and only building it needs OpenCV.
+    """
+
+    def __init__(self, path: str, screen: pygame.Surface, opacity: float, cache_dir: str = '.cache'):
+        self.path = path
+        self.width, self.height = screen.get_size()
+        self.opacity = opacity
+        self.cache_path = self.get_cache_path(screen, cache_dir)
+        if not os.path.exists(self.cache_path):
+            self.build(screen)
+        self.frames = np.memmap(self.cache_path, dtype=np.uint32, mode='r').reshape(-1, self.width * self.height)
+        if len(self.frames) == 0:
+            raise ValueError(f"{path} has no frames")
+        self.position = 0  # Next frame to show
+
+    def get_cache_path(self, screen: pygame.Surface, cache_dir: str) -> str:
+        digest = hashlib.sha1()
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        digest.update(f"{self.width}x{self.height}:{screen.get_bitsize()}:{screen.get_masks()}:"
+                      f"{self.opacity}".encode())
+        return os.path.join(cache_dir, f"bg-{digest.hexdigest()[:16]}.raw")
+
+    def build(self, screen: pygame.Surface):
+        """Decode and composite every frame once, appending them to the cache file"""
+        import cv2
+
+        video = cv2.VideoCapture(self.path)
+        if not video.isOpened():
+            raise ValueError(f"Could not open {self.path}")
+
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        temp_path = self.cache_path + '.tmp'
+        frame_count = 0
+        compositor = FrameCompositor(screen, self.opacity)
+        pixels = np.empty(self.width * self.height, dtype=np.uint32)
+        try:
+            with open(temp_path, 'wb') as f:
+                while True:
+                    ret, frame = video.read()
+                    if not ret:
+                        break
+                    compositor.composite(frame, pixels)
+                    f.write(pixels.tobytes())
+                    frame_count += 1
+            os.replace(temp_path, self.cache_path)  # Never leave a half-built cache behind
+        finally:
+            video.release()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        print(f"Cached {frame_count} background frames to {self.cache_path}")
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def next_frame(self, steps: int = 1) -> np.ndarray:
+        """Advance steps frames, looping at the end, and return the frame to show"""
+        frame = self.frames[(self.position + steps - 1) % len(self.frames)]
+        self.position = (self.position + steps) % len(self.frames)
+        return frame
+
+    def restart(self):
+        self.position = 0
+
+    def close(self):
+        self.frames = None
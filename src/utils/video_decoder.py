@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+
+import numpy as np
+import pygame
+from src.utils.video_cache import FrameCompositor
+
+class VideoDecoder:
+    """Background video decoded on a thread into a bounded ring of screen-ready frames.
+
+    The decoder thread reads, composites (see FrameCompositor) and queues
+    frames ahead of the game, blocking once buffer_frames are waiting, and
+    seeks back to the start itself when the video ends. The game thread only
+    swaps buffers.
+
+    With frame_locked set (offline rendering) every game frame takes the
+    next video frame, waiting for it if need be, so the output is the same
+    however fast the decoder runs. In live play a missing frame is an
+    underrun: the last frame is shown again instead of stalling.
+    """
+
+    def __init__(self, path: str, screen: pygame.Surface, opacity: float, buffer_frames: int = 8):
+        import cv2
+
+        self.video = cv2.VideoCapture(path)
+        if not self.video.isOpened():
+            raise ValueError(f"Could not open {path}")
+        self.path = path
+        self.compositor = FrameCompositor(screen, opacity)
+        self.frame_locked = False
+
+        # One more buffer than the ring holds: the frame on screen
+        size = screen.get_width() * screen.get_height()
+        self.free_buffers = queue.Queue()
+        self.ready_frames = queue.Queue()
+        for _ in range(buffer_frames + 1):
+            self.free_buffers.put(np.empty(size, dtype=np.uint32))
+        self.current = None
+        # Bumped by restart(); frames decoded before it are discarded
+        self.generation = 0
+        self.stopping = False
+        self.error = None
+
+        self.frames_shown = 0
+        self.underruns = 0
+        self.stall_time = 0.0
+        self.frames_dropped = 0
+        self.loops = 0
+
+        self.thread = threading.Thread(target=self.decode_loop, name="video-decoder", daemon=True)
+        self.thread.start()
+
+    def decode_loop(self):
+        import cv2
+
+        decoded_generation = self.generation
+        try:
+            while True:
+                buffer = self.free_buffers.get()
+                if self.stopping:
+                    break
+                generation = self.generation
+                if generation != decoded_generation:
+                    self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    decoded_generation = generation
+
+                ret, frame = self.video.read()
+                if not ret:
+                    # Video ended, loop back to start
+                    self.loops += 1
+                    self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    ret, frame = self.video.read()
+                    if not ret:
+                        raise ValueError(f"{self.path} has no frames")
+                self.compositor.composite(frame, buffer)
+                self.ready_frames.put((generation, buffer))
+        except Exception as e:
+            self.error = e
+            self.ready_frames.put(None)  # Wake a waiting game thread
+        finally:
+            self.video.release()
+
+    def take_frame(self, block: bool):
+        """The next decoded frame of the current generation, or None if there is none yet"""
+        while True:
+            try:
+                item = self.ready_frames.get(block=block)
+            except queue.Empty:
+                return None
+            if item is None:
+                self.ready_frames.put(None)  # Keep reporting the failure
+                return None
+            generation, buffer = item
+            if generation == self.generation:
+                return buffer
+            self.free_buffers.put(buffer)  # Decoded before a restart
+
+    def next_frame(self, steps: int = 1) -> np.ndarray:
+        """Advance steps frames and return the frame to show, or None before the first one.
+
+        Live, frames past the first of several steps are dropped to catch
+        up, and an empty ring repeats the frame on screen.
+        """
+        for step in range(steps):
+            buffer = self.take_frame(block=False)
+            if buffer is None:
+                if self.error is not None:
+                    break
+                self.underruns += 1
+                if not (self.frame_locked or self.current is None):
+                    break  # Repeat the frame on screen rather than wait
+                stall_start = time.perf_counter()
+                buffer = self.take_frame(block=True)
+                self.stall_time += time.perf_counter() - stall_start
+                if buffer is None:
+                    break
+            if step > 0:
+                self.frames_dropped += 1
+            if self.current is not None:
+                self.free_buffers.put(self.current)
+            self.current = buffer
+        if self.current is not None:
+            self.frames_shown += 1
+        return self.current
+
+    def restart(self):
+        """Play from the first frame again; frames already decoded are discarded as they come up"""
+        self.generation += 1
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames_shown,
+            'underruns': self.underruns,
+            'stall_time': self.stall_time,
+            'dropped': self.frames_dropped,
+            'loops': self.loops,
+        }
+
+    def close(self):
+        self.stopping = True
+        self.free_buffers.put(None)  # Wake the decoder if the ring is full
+        self.thread.join(timeout=1.0)